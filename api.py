@@ -6,17 +6,56 @@ API服务器，用于提供Web界面与后端通信的接口
 """
 
 import os
+import copy
 import json
+import codecs
+import re
+import gzip
+import time
+import zlib
+import functools
+import asyncio
 import logging
+import logging.config
+import threading
 import yaml
 from datetime import datetime
 from pathlib import Path
+from uuid import uuid4
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
 
-from flask import Flask, jsonify, request, send_from_directory
-from flask_cors import CORS
+from quart import Quart, Response, request, send_from_directory
+from quart.json.provider import DefaultJSONProvider
+from quart.wrappers.response import DataBody
+from quart_cors import cors
+from werkzeug.exceptions import HTTPException
 
-# 创建日志记录器
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson  # C实现的JSON解析，比标准库json快数倍
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml未安装时回退到标准库xml.etree
+    lxml_etree = None
+
+# 创建日志记录器（统一格式，Hypercorn的日志也使用同一个handler）
+logging.config.dictConfig({
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'default'},
+    },
+    'root': {'level': 'INFO', 'handlers': ['console']},
+})
 logger = logging.getLogger(__name__)
 
 # 定义目录路径
@@ -26,6 +65,43 @@ CONFIG_PATH = os.path.join(BASE_DIR, "config.yaml")
 HISTORY_DIR = os.path.join(BASE_DIR, "history")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
+# 优先使用libyaml的C实现，不可用时回退到纯Python实现
+SafeLoader = yaml.CSafeLoader if hasattr(yaml, 'CSafeLoader') else yaml.SafeLoader
+SafeDumper = yaml.CSafeDumper if hasattr(yaml, 'CSafeDumper') else yaml.SafeDumper
+
+# 后台任务（job_id -> _Job），仅在单进程内有效
+JOBS = {}
+PROGRESS_STREAM_TIMEOUT = 120  # 单个SSE连接的最长时间（秒），客户端会自动重连
+PROGRESS_HEARTBEAT_INTERVAL = 15  # 心跳间隔（秒）
+JOB_RESULT_TTL = 600  # 任务结束后保留最终状态的秒数，供重连的客户端读取
+
+# 输出文件名中的日期时间，兼容 arxiv_filtered_YYYYMMDD_HHMMSS.xml 与 YYYYMMDD_HHMMSS_<缩写>.xml
+_FN_RE = re.compile(r'^(?:arxiv_filtered_)?(\d{8})(?:_(\d{6}))?(?:_[^.]*)?\.xml$')
+
+# 文件读取线程池，用于并行读取多个小文件
+_IO_POOL = ThreadPoolExecutor(max_workers=8)
+
+# RSS描述中的匹配关键词片段
+_KW_RE = re.compile(r'Matched keywords:\s*([^.]*)')
+
+STREAM_CHUNK_SIZE = 8192  # 流式读取文件时的块大小（字节）
+
+# JSON响应gzip压缩：小于该大小的响应不压缩；压缩级别1以速度为主
+GZIP_MIN_SIZE = 2048
+GZIP_LEVEL = 1
+
+# /api/status 响应缓存，键为 (最新输出文件名, st_mtime_ns)，值为序列化后的响应体
+_STATUS_CACHE = {"key": None, "value": None}
+
+# 历史记录摘要索引（每行一条JSON，由main.save_history_record追加），及其解析缓存
+HISTORY_INDEX_FILE = os.path.join(HISTORY_DIR, "index.jsonl")
+HISTORY_TEMPLATE_FILE = "template.json"
+_HISTORY_INDEX_CACHE = {"key": None, "records": []}
+
+# 订阅历史响应缓存：文件路径 -> ((st_mtime_ns, st_size), 序列化后的响应体)
+# 只缓存固定的几个历史文件，大小有界
+_JSON_FILE_CACHE = {}
+
 # 确保目录存在
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(HISTORY_DIR, exist_ok=True)
@@ -33,805 +109,1228 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 
 # 导入本地模块（确保这些模块正确）
 try:
-    from config_loader import load_config, save_config
-    from main import run_pipeline_with_subscription, run_pipeline
+    from config_loader import load_config, save_config, reload_config
+    from main import run_pipeline_with_subscription, run_pipeline, HISTORY_INDEX_LOCK
 except ImportError as e:
     logger.error(f"导入本地模块失败: {e}")
     # 提供备用实现以确保API服务能启动
+    # 已解析配置的缓存，键为 (配置文件路径, st_mtime_ns)
+    _CFG_CACHE = {}
+    
     def load_config():
         try:
             if os.path.exists(CONFIG_PATH):
-                with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
+                key = (CONFIG_PATH, os.stat(CONFIG_PATH).st_mtime_ns)
+                if key not in _CFG_CACHE:
+                    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+                        _CFG_CACHE.clear()  # 只保留当前版本
+                        _CFG_CACHE[key] = yaml.load(f, Loader=SafeLoader) or {}
+                return copy.deepcopy(_CFG_CACHE[key])
             return {}
         except Exception as e:
             logger.error(f"加载配置失败: {e}")
             return {}
     
+    def reload_config():
+        _CFG_CACHE.clear()  # 丢弃缓存，强制重新解析
+        return load_config()
+    
     def save_config(config, file_path=CONFIG_PATH):
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False)
+                yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False)
+            _CFG_CACHE.clear()  # 写入后使缓存失效
             return True
         except Exception as e:
             logger.error(f"保存配置失败: {e}")
             return False
     
-    def run_pipeline():
+    def run_pipeline(progress=None):
         logger.error("无法运行主流程，因为main模块导入失败")
         return {"error": "main模块导入失败，无法运行流程"}
     
-    def run_pipeline_with_subscription():
+    def run_pipeline_with_subscription(progress=None):
         logger.error("无法运行完整流程，因为main模块导入失败")
         return {"error": "main模块导入失败，无法运行完整流程"}
+    
+    HISTORY_INDEX_LOCK = threading.Lock()
 
-app = Flask(__name__)
-CORS(app)
+@functools.cache
+def _mime_classes():
+    """延迟导入邮件构建类，首次调用后缓存"""
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    return MIMEText, MIMEMultipart
 
-@app.route('/api/run', methods=['POST'])
-def run_bot():
-    """触发机器人运行"""
+@functools.cache
+def _send_email_message():
+    """延迟导入邮件发送函数（连同进程内复用的SMTP连接）"""
+    from email_notifier import send_email_message
+    return send_email_message
+
+@functools.cache
+def _email_sub():
+    """延迟导入RSS邮件订阅模块"""
+    import email_subscription
+    return email_subscription
+
+@functools.cache
+def _conf_sub():
+    """延迟导入会议订阅模块（依赖较重，仅在使用会议功能时加载）"""
+    import conference_subscription
+    return conference_subscription
+
+@functools.cache
+def _conf_fetch():
+    """延迟导入OpenReview会议论文获取模块"""
+    import openreview_fetcher
+    return openreview_fetcher
+
+@functools.cache
+def _conf_sched():
+    """延迟导入会议调度器模块"""
+    import conference_scheduler
+    return conference_scheduler
+
+def _output_sort_key(filename):
+    """输出文件的排序键：返回YYYYMMDD[HHMMSS]，无法提取日期时返回'0'"""
+    # 常见格式（YYYYMMDD_HHMMSS开头，可带arxiv_filtered_前缀）直接按固定位置切片，不走正则
+    stem = filename[15:] if filename.startswith('arxiv_filtered_') else filename
+    if len(stem) > 15 and stem[8] == '_' and stem[:8].isdigit() and stem[9:15].isdigit() and stem[15] in '_.':
+        return stem[:8] + stem[9:15]
+    m = _FN_RE.match(filename)
+    return (m.group(1) + (m.group(2) or '')) if m else '0'
+
+def _scan_dir(directory, suffix):
+    """用os.scandir单次遍历目录，返回指定后缀的普通文件DirEntry列表（DirEntry会缓存stat结果）；目录不存在时返回空列表"""
+    try:
+        with os.scandir(directory) as it:
+            # 先按后缀过滤，再用d_type判断是否为文件（通常无需额外stat）
+            return [e for e in it if e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+def _list_files_by_mtime(directory, suffix):
+    """列出目录中指定后缀的文件，按修改时间排序（最新在前）"""
+    entries = [(e.stat().st_mtime_ns, e.name) for e in _scan_dir(directory, suffix)]
+    entries.sort(reverse=True)
+    return [name for _, name in entries]
+
+def _tail_lines(file_path, max_lines):
+    """从文件末尾按块向前读取，直到凑够max_lines行，只解码最后这些行（阻塞操作，等价于tail -n）"""
+    chunks = deque()
+    newlines = 0
+    with open(file_path, 'rb', buffering=0) as f:
+        pos = f.seek(0, os.SEEK_END)
+        # 多读到一个换行符，保证最早的一行是完整的
+        while pos > 0 and newlines <= max_lines:
+            size = min(STREAM_CHUNK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.appendleft(chunk)
+            newlines += chunk.count(b'\n')
+    
+    lines = b''.join(chunks).splitlines()[-max_lines:]
+    return [line.decode('utf-8', errors='replace') for line in lines]
+
+def _read_bytes_file(file_path):
+    """以二进制方式读取整个文件（阻塞操作）；不使用缓冲层，按文件大小一次读入，省去一次内存拷贝"""
+    with open(file_path, 'rb', buffering=0) as f:
+        return f.read()
+
+def _read_json_file(file_path):
+    """读取并用orjson解析JSON文件（阻塞操作，需通过asyncio.to_thread调用）"""
+    return _json_loads(_read_bytes_file(file_path))
+
+def _accepts_gzip():
+    """请求的Accept-Encoding是否接受gzip"""
+    return request.accept_encodings['gzip'] > 0
+
+async def _gzip_stream(chunks):
+    """把异步生成的文本/字节块压缩为gzip流"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits=31 输出gzip格式
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _wants_raw_xml():
+    """判断输出文件请求是否应直接返回XML：?raw=1，或Accept头优先XML（如RSS阅读器）；?envelope=1强制JSON封装"""
+    if request.args.get('envelope'):
+        return False
+    if request.args.get('raw'):
+        return True
+    best = request.accept_mimetypes.best_match(
+        ['application/json', 'application/rss+xml', 'application/xml', 'text/xml']
+    )
+    return best is not None and best != 'application/json'
+
+def _cache_headers(tag, mtime):
+    """
+    生成ETag和Last-Modified响应头（mtime为秒级时间戳）
+    
+    Last-Modified只有秒级精度：mtime仍在当前这一秒内时，同一秒内的后续修改无法通过
+    If-Modified-Since区分，此时只返回ETag
+    """
+    headers = {'ETag': f'"{tag}"'}
+    if int(mtime) < int(time.time()):
+        headers['Last-Modified'] = formatdate(mtime, usegmt=True)
+    return headers
+
+def _file_cache_headers(st):
+    """根据文件的stat结果生成ETag和Last-Modified响应头"""
+    return _cache_headers(f"{int(st.st_mtime)}-{st.st_size}", st.st_mtime)
+
+def _is_not_modified(cache_headers, mtime):
+    """检查请求的If-None-Match/If-Modified-Since，判断客户端缓存是否仍然有效"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        # 弱比较：列表中任一标签（忽略W/前缀）与当前ETag相同，或为*时，缓存有效
+        if if_none_match.strip() == '*':
+            return True
+        etag = cache_headers['ETag']
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+    
+    # 只有没有If-None-Match时才检查If-Modified-Since（RFC 9110 §13.2.2），按秒向下取整比较
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since and 'Last-Modified' in cache_headers:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= int(mtime)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _json_dumps(obj):
+    """把对象序列化为JSON；有orjson时直接生成bytes，比标准库json快数倍"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False)
+
+def _json_bytes(obj):
+    """序列化为JSON字节串"""
+    body = _json_dumps(obj)
+    return body if isinstance(body, bytes) else body.encode('utf-8')
+
+def ojson(obj, status=200):
+    """把对象序列化为JSON响应"""
+    return Response(_json_dumps(obj), status=status, mimetype='application/json')
+
+def ok(**fields):
+    """成功响应（200）：{'success': True, **fields}"""
+    return ojson({'success': True, **fields})
+
+def err(message, status=500):
+    """错误响应：{'success': False, 'error': message}"""
+    return ojson({'success': False, 'error': message}, status=status)
+
+def api_endpoint(error_message):
+    """路由装饰器：统一记录处理耗时，并把未处理的异常转换为500 JSON错误响应"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except HTTPException:
+                raise  # 404等HTTP错误交给Quart处理
+            except Exception as e:
+                logger.exception(f"{error_message}: {str(e)}")
+                return err(str(e))
+            finally:
+                logger.debug(f"{fn.__name__} took {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return wrapper
+    return decorator
+
+def _read_history_meta(file_path):
+    """读取历史记录文件，只返回元数据，不包含完整论文列表（阻塞操作）"""
+    data = _read_json_file(file_path)
+    config = data.get('config', {})
+    return {
+        'id': data.get('id'),
+        'timestamp': data.get('timestamp'),
+        'papers_count': data.get('papers_count', 0),
+        'keywords': config.get('keywords', []),
+        'categories': config.get('categories', []),
+        'output_file': data.get('output_file')
+    }
+
+def _read_history_summary(file):
+    """线程池任务：读取单个历史记录的元数据，出错时记录日志并返回None"""
     try:
-        logger.info("Manual run triggered via API")
-        result = run_pipeline_with_subscription()
+        return _read_history_meta(os.path.join(HISTORY_DIR, file))
+    except Exception as e:
+        logger.error(f"Error reading history file {file}: {str(e)}")
+        return None
+
+def _history_record_names():
+    """历史记录目录中的记录文件名（不含模板文件），按修改时间从旧到新排列"""
+    entries = sorted(
+        (e.stat().st_mtime_ns, e.name) for e in _scan_dir(HISTORY_DIR, '.json')
+        if e.name != HISTORY_TEMPLATE_FILE  # 模板文件不是真实的运行记录
+    )
+    return [name for _, name in entries]
+
+def _rebuild_history_index():
+    """遍历历史记录目录，按修改时间从旧到新重写索引文件，返回记录数（阻塞操作）"""
+    # 与 main.save_history_record 的追加共用一把锁：重建期间的追加会等到新索引就位后再写入
+    with HISTORY_INDEX_LOCK:
+        return _rebuild_history_index_locked()
+
+def _rebuild_history_index_locked():
+    """重写索引文件，调用方持有 HISTORY_INDEX_LOCK"""
+    names = _history_record_names()
+    while True:
+        summaries = _IO_POOL.map(_read_history_summary, names)
+        lines = [_json_bytes(summary) + b'\n' for summary in summaries if summary is not None]
+        
+        # 先写临时文件再替换，避免读取到写了一半的索引
+        tmp_file = HISTORY_INDEX_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.writelines(lines)
+        os.replace(tmp_file, HISTORY_INDEX_FILE)
+        
+        # 其他进程（如定时运行的main.py）不受进程内锁的保护，重建期间新增了记录时再重建一次
+        current = _history_record_names()
+        if set(current) <= set(names):
+            break
+        names = current
+    logger.info(f"History index rebuilt with {len(lines)} records")
+    return len(lines)
+
+def _load_history_index():
+    """读取历史记录索引，返回摘要列表（最新在前）；索引不存在时先重建，按文件mtime缓存（阻塞操作）"""
+    try:
+        st = os.stat(HISTORY_INDEX_FILE)
+    except FileNotFoundError:
+        with HISTORY_INDEX_LOCK:
+            # 并发的请求可能已在等待锁期间完成了重建
+            if not os.path.exists(HISTORY_INDEX_FILE):
+                _rebuild_history_index_locked()
+        st = os.stat(HISTORY_INDEX_FILE)
+    
+    key = (st.st_mtime_ns, st.st_size)
+    if _HISTORY_INDEX_CACHE["key"] == key:
+        return _HISTORY_INDEX_CACHE["records"]
+    
+    records = {}
+    for line in _read_bytes_file(HISTORY_INDEX_FILE).splitlines():
+        if not line.strip():
+            continue
+        try:
+            summary = _json_loads(line)
+        except ValueError as e:
+            logger.warning(f"Skipping malformed history index line: {str(e)}")
+            continue
+        records.pop(summary.get('id'), None)  # 同一记录出现多次时保留最后一次
+        records[summary.get('id')] = summary
+    
+    newest_first = list(records.values())[::-1]
+    _HISTORY_INDEX_CACHE["key"] = key
+    _HISTORY_INDEX_CACHE["records"] = newest_first
+    return newest_first
+
+def _history_with_log_body(load_history, history_file, log_file):
+    """读取订阅历史（快照 + 增量日志，附加count）并序列化为响应体；两个文件都未变化时直接返回缓存（阻塞操作）"""
+    key = tuple(
+        (st.st_mtime_ns, st.st_size) if st else None
+        for st in map(_stat_or_none, (history_file, log_file))
+    )
+    cached = _JSON_FILE_CACHE.get(history_file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    history = load_history()
+    # 添加计数
+    history['count'] = len(history.get('sent_papers', []))
+    body = _json_dumps({'success': True, 'history': history})
+    _JSON_FILE_CACHE[history_file] = (key, body)
+    return body
+
+def _stat_or_none(file_path):
+    """文件不存在时返回None而不是抛出异常"""
+    try:
+        return os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+def _rss_item_to_paper(title, desc_text):
+    """把RSS条目的标题和描述转换为仪表盘需要的论文数据"""
+    paper_data = {
+        'title': title if title is not None else 'Untitled',
+        'keywords': [],
+    }
+    
+    # Extract keywords from description
+    m = _KW_RE.search(desc_text) if desc_text else None
+    if m:
+        paper_data['keywords'] = [kw.strip() for kw in m.group(1).split(',')]
+    return paper_data
+
+def _extract_rss_papers(file_path):
+    """解析RSS文件，提取仪表盘需要的论文标题和关键词（阻塞操作，需通过asyncio.to_thread调用）"""
+    if lxml_etree is not None:
+        # lxml流式解析：逐个处理<item>并立即释放，内存占用与论文数量无关
+        papers = []
+        for _, el in lxml_etree.iterparse(file_path, tag='item'):
+            title = el.findtext('title')
+            papers.append(_rss_item_to_paper(title, el.findtext('description')))
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+        return papers
+    
+    # 标准库同样流式解析：处理完一个<item>就清空，不构建完整的DOM
+    import xml.etree.ElementTree as ET
+    papers = []
+    channel = None
+    for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'channel':
+                channel = elem
+            continue
+        if elem.tag == 'item':
+            papers.append(_rss_item_to_paper(elem.findtext('title'), elem.findtext('description')))
+            elem.clear()
+            if channel is not None and len(channel) and channel[-1] is elem:
+                del channel[-1]  # 从父节点移除已处理的条目，释放内存
+    return papers
+
+class OrjsonProvider(DefaultJSONProvider):
+    """使用orjson的JSON provider，request.get_json()和app.json序列化都走orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:  # orjson不支持的参数（如indent、sort_keys）交给标准库处理
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+app = Quart(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+app = cors(app)
+
+@app.after_request
+async def compress_json_response(response):
+    """客户端支持gzip时压缩较大的JSON响应（流式响应和文件响应除外）"""
+    if (
+        response.status_code != 200
+        or response.mimetype != 'application/json'
+        or 'Content-Encoding' in response.headers
+        or not isinstance(response.response, DataBody)
+        or not _accepts_gzip()
+    ):
+        return response
+    
+    data = await response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+class _Job:
+    """
+    后台任务的进度状态
+    
+    只保存最新的一条进度消息（包括最终的done/error），而不是一次性消费的队列：
+    客户端断开重连后仍能读到当前状态，最终状态也不会因为连接中断而丢失。
+    状态只在事件循环线程中修改，工作线程通过 publish_threadsafe 提交
+    """
+    
+    def __init__(self, loop):
+        self.loop = loop
+        self.state = {'status': 'queued', 'percent': 0}
+        self.version = 0
+        self.finished_at = None
+        self._changed = asyncio.Event()
+    
+    @property
+    def finished(self):
+        return self.finished_at is not None
+    
+    def publish(self, msg):
+        """更新状态并唤醒等待中的订阅者（在事件循环线程中调用）"""
+        self.state = msg
+        self.version += 1
+        if msg.get('status') in ('done', 'error'):
+            self.finished_at = time.monotonic()
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    def publish_threadsafe(self, msg):
+        """从工作线程提交状态"""
+        self.loop.call_soon_threadsafe(self.publish, msg)
+    
+    async def wait_changed(self, timeout):
+        """等待下一次状态变化，超时抛出 asyncio.TimeoutError"""
+        await asyncio.wait_for(self._changed.wait(), timeout)
+
+def _prune_jobs():
+    """删除结束超过 JOB_RESULT_TTL 的任务（包括从未被订阅的任务）"""
+    cutoff = time.monotonic() - JOB_RESULT_TTL
+    for job_id in [job_id for job_id, job in JOBS.items() if job.finished and job.finished_at < cutoff]:
+        del JOBS[job_id]
+
+def _execute_pipeline_job(job):
+    """后台线程：运行完整流程，并把进度提交到任务状态"""
+    job.publish_threadsafe({'status': 'running', 'stage': 'start', 'percent': 5})
+    try:
+        # 各阶段（获取、过滤、生成RSS、保存历史、邮件订阅）开始时推送进度
+        result = run_pipeline_with_subscription(
+            progress=lambda stage, percent: job.publish_threadsafe({'status': 'running', 'stage': stage, 'percent': percent})
+        )
         
         # 如果运行成功并生成了新的输出文件，返回更详细的信息
         if result.get('success') and result.get('output_file'):
-            output_file = result.get('output_file')
-            history_id = result.get('history_id')
             papers_count = result.get('papers_count', 0)
-            elapsed_time = result.get('elapsed_time', '')
-            
-            return jsonify({
-                'success': True, 
+            payload = {
+                'success': True,
                 'message': f'Pipeline completed successfully. Generated {papers_count} papers.',
                 'result': {
-                    'output_file': output_file,
-                    'history_id': history_id,
+                    'output_file': result.get('output_file'),
+                    'history_id': result.get('history_id'),
                     'papers_count': papers_count,
                     'timestamp': datetime.now().isoformat(),
-                    'elapsed_time': elapsed_time
+                    'elapsed_time': result.get('elapsed_time', '')
                 }
-            })
+            }
         else:
             # 如果没有生成新的输出文件或运行失败
-            return jsonify({
+            payload = {
                 'success': result.get('success', False),
                 'message': result.get('message', 'Unknown error'),
                 'result': result
-            })
+            }
+        job.publish_threadsafe({'status': 'done', 'percent': 100, **payload})
     except Exception as e:
-        logger.error(f"Error running pipeline: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.error(f"Error running pipeline job: {str(e)}")
+        job.publish_threadsafe({'status': 'error', 'percent': 100, 'success': False, 'error': str(e)})
+
+@app.route('/api/run', methods=['POST'])
+@api_endpoint("Error running pipeline")
+async def run_bot():
+    """触发机器人运行（后台执行，立即返回job_id，进度通过 /api/progress/<job_id> 推送）"""
+    logger.info("Manual run triggered via API")
+    _prune_jobs()
+    job_id = uuid4().hex
+    job = JOBS[job_id] = _Job(asyncio.get_running_loop())
+    threading.Thread(target=_execute_pipeline_job, args=(job,), daemon=True).start()
+    
+    return ok(job_id=job_id, message='Pipeline started')
+
+@app.route('/api/progress/<job_id>', methods=['GET'])
+@api_endpoint("Error streaming job progress")
+async def job_progress(job_id):
+    """以Server-Sent Events推送后台任务进度"""
+    _prune_jobs()
+    job = JOBS.get(job_id)
+    if job is None:
+        return err('Job not found', status=404)
+    
+    async def generate():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + PROGRESS_STREAM_TIMEOUT
+        sent_version = -1
+        while loop.time() < deadline:
+            # 每个连接（包括重连）先收到当前状态；任务已结束时直接重放最终状态
+            if job.version != sent_version:
+                sent_version = job.version
+                yield f"data: {json.dumps(job.state)}\n\n"
+                if job.finished:
+                    return
+                continue
+            try:
+                await job.wait_changed(PROGRESS_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # 心跳，防止代理断开空闲连接
+                yield ": heartbeat\n\n"
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None
+    return response
 
 @app.route('/api/run/rss-only', methods=['POST'])
-def run_bot_rss_only():
+@api_endpoint("Error running RSS-only pipeline")
+async def run_bot_rss_only():
     """触发机器人运行（仅生成RSS，不发送邮件）"""
-    try:
-        logger.info("Manual RSS-only run triggered via API")
-        result = run_pipeline()
+    logger.info("Manual RSS-only run triggered via API")
+    result = await asyncio.to_thread(run_pipeline)
+    
+    # 如果运行成功并生成了新的输出文件，返回更详细的信息
+    if result.get('success') and result.get('output_file'):
+        output_file = result.get('output_file')
+        history_id = result.get('history_id')
+        papers_count = result.get('papers_count', 0)
+        elapsed_time = result.get('elapsed_time', '')
         
-        # 如果运行成功并生成了新的输出文件，返回更详细的信息
-        if result.get('success') and result.get('output_file'):
-            output_file = result.get('output_file')
-            history_id = result.get('history_id')
-            papers_count = result.get('papers_count', 0)
-            elapsed_time = result.get('elapsed_time', '')
-            
-            return jsonify({
-                'success': True, 
-                'message': f'RSS generation completed successfully. Generated {papers_count} papers (no email sent).',
-                'result': {
-                    'output_file': output_file,
-                    'history_id': history_id,
-                    'papers_count': papers_count,
-                    'timestamp': datetime.now().isoformat(),
-                    'elapsed_time': elapsed_time,
-                    'email_sent': False
-                }
-            })
-        else:
-            # 如果没有生成新的输出文件或运行失败
-            return jsonify({
-                'success': result.get('success', False),
-                'message': result.get('message', 'Unknown error'),
-                'result': result
-            })
-    except Exception as e:
-        logger.error(f"Error running RSS-only pipeline: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ok(
+            message=f'RSS generation completed successfully. Generated {papers_count} papers (no email sent).',
+            result={
+                'output_file': output_file,
+                'history_id': history_id,
+                'papers_count': papers_count,
+                'timestamp': datetime.now().isoformat(),
+                'elapsed_time': elapsed_time,
+                'email_sent': False
+            }
+        )
+    else:
+        # 如果没有生成新的输出文件或运行失败
+        return ojson({
+            'success': result.get('success', False),
+            'message': result.get('message', 'Unknown error'),
+            'result': result
+        })
 
 @app.route('/api/config', methods=['GET', 'POST'])
-def config():
+@api_endpoint("Error with configuration")
+async def config():
     """获取或更新配置"""
-    try:
-        if request.method == 'GET':
-            config = load_config()
-            return jsonify({'success': True, 'config': config})
-        else:
-            data = request.json
-            new_config = data.get('config', {})
-            save_config(new_config, CONFIG_PATH)
-            return jsonify({'success': True, 'message': 'Configuration updated'})
-    except Exception as e:
-        logger.error(f"Error with configuration: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    if request.method == 'GET':
+        config = await asyncio.to_thread(load_config)
+        return ok(config=config)
+    else:
+        data = await request.get_json()
+        new_config = data.get('config', {})
+        await asyncio.to_thread(save_config, new_config, CONFIG_PATH)
+        return ok(message='Configuration updated')
+
+@app.route('/api/config/reload', methods=['POST'])
+@api_endpoint("Error reloading configuration")
+async def reload_configuration():
+    """丢弃配置缓存并重新从磁盘加载（手动编辑config.yaml后使用）"""
+    config = await asyncio.to_thread(reload_config)
+    return ok(message='Configuration reloaded', config=config)
 
 @app.route('/api/output', methods=['GET'])
-def list_output():
+@api_endpoint("Error listing output files")
+async def list_output():
     """列出输出文件"""
-    try:
-        # 获取所有XML文件
-        files = []
-        
-        if os.path.exists(OUTPUT_DIR):
-            files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.xml')]
-        
-        # 确保文件存在
-        if not files:
-            logger.info("No output files found")
-            return jsonify({'success': True, 'files': []})
-            
-        # 按文件名排序，格式为arxiv_filtered_YYYYMMDD_HHMMSS.xml，最新的排前面
-        def extract_date(filename):
-            try:
-                if 'arxiv_filtered_' in filename:
-                    date_part = filename.replace('arxiv_filtered_', '').replace('.xml', '')
-                    if '_' in date_part:  # 包含时间戳
-                        date_str, time_str = date_part.split('_')
-                        return f"{date_str}{time_str}"  # 返回YYYYMMDDHHMMSS格式用于排序
-                    return date_part  # 仅日期部分
-                return '0'  # 无法提取日期时的默认值
-            except Exception:
-                return '0'
-                
-        files.sort(key=extract_date, reverse=True)  # 按日期排序，最新的排前面
-        
+    # 目录的mtime在文件增删改名时变化，列表未变化时直接返回304
+    dir_st = await asyncio.to_thread(os.stat, OUTPUT_DIR)
+    cache_headers = _cache_headers(dir_st.st_mtime_ns, dir_st.st_mtime)
+    if _is_not_modified(cache_headers, dir_st.st_mtime):
+        return Response('', status=304, headers=cache_headers)
+    
+    # 获取所有XML文件
+    files = [e.name for e in await asyncio.to_thread(_scan_dir, OUTPUT_DIR, '.xml')]
+    
+    # 确保文件存在
+    if not files:
+        logger.info("No output files found")
+    else:
+        files.sort(key=_output_sort_key, reverse=True)  # 按日期排序，最新的排前面
         logger.info(f"Found {len(files)} output files")
-        return jsonify({'success': True, 'files': files})
-    except Exception as e:
-        logger.error(f"Error listing output files: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    response = ok(files=files)
+    response.headers.update(cache_headers)
+    return response
 
 @app.route('/api/output/<filename>', methods=['GET', 'DELETE'])
-def get_output_file(filename):
+@api_endpoint("Error reading output file")
+async def get_output_file(filename):
     """获取特定输出文件的内容"""
-    try:
-        if request.method == 'GET':
-            file_path = os.path.join(OUTPUT_DIR, filename)
-            if not os.path.exists(file_path):
-                return jsonify({'success': False, 'error': 'File not found'}), 404
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return jsonify({'success': True, 'filename': filename, 'content': content})
-        elif request.method == 'DELETE':
-            file_path = os.path.join(OUTPUT_DIR, filename)
-            if not os.path.exists(file_path):
-                return jsonify({'success': False, 'error': 'File not found'}), 404
-            os.remove(file_path)
-            return jsonify({'success': True, 'message': 'File deleted'})
-    except Exception as e:
-        logger.error(f"Error reading output file: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/email/test', methods=['POST'])
-def test_email_config():
-    """测试邮件配置是否有效"""
-    try:
-        data = request.json
-        email_config = data.get('email_config', {})
-        
-        # 检查必要的配置
-        required_fields = ['smtp_server', 'port', 'username', 'password', 'recipient']
-        missing_fields = [field for field in required_fields if not email_config.get(field)]
-        
-        if missing_fields:
-            return jsonify({
-                'success': False, 
-                'error': f'Missing required fields: {", ".join(missing_fields)}'
-            }), 400
-        
-        # 导入邮件发送模块
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-        
-        # 创建测试邮件
-        msg = MIMEMultipart()
-        msg['From'] = email_config['username']
-        msg['To'] = email_config['recipient']
-        msg['Subject'] = 'arXiv RSS Filter Bot - Email Configuration Test'
-        
-        body = """
-        <html>
-        <body>
-            <h2>Email Configuration Test</h2>
-            <p>This is a test email to verify your email configuration for arXiv RSS Filter Bot.</p>
-            <p>If you received this email, your configuration is working correctly.</p>
-        </body>
-        </html>
-        """
+    if request.method == 'GET':
+        file_path = os.path.join(OUTPUT_DIR, filename)
+        if not os.path.exists(file_path):
+            return err('File not found', status=404)
         
-        msg.attach(MIMEText(body, 'html'))
+        # 客户端只需要原始XML时直接发送文件，不经过JSON封装（支持Range和304条件请求）
+        if _wants_raw_xml():
+            response = await send_from_directory(OUTPUT_DIR, filename, mimetype='application/xml', conditional=True)
+            response.vary.add('Accept')
+            return response
         
-        # 发送邮件
-        with smtplib.SMTP(email_config['smtp_server'], email_config['port']) as server:
-            server.starttls()
-            server.login(email_config['username'], email_config['password'])
-            server.send_message(msg)
+        # 输出文件生成后不再变化，客户端缓存仍有效时直接返回304
+        st = await asyncio.to_thread(os.stat, file_path)
+        cache_headers = _file_cache_headers(st)
+        if _is_not_modified(cache_headers, st.st_mtime):
+            return Response('', status=304, headers=cache_headers)
         
-        return jsonify({
-            'success': True, 
-            'message': f'Test email sent successfully to {email_config["recipient"]}'
-        })
+        # JSON封装：按8 KiB分块读取文件并逐块转义输出，不把整个文件读入内存
+        async def generate():
+            yield '{"success": true, "filename": %s, "content": "' % json.dumps(filename)
+            # 以二进制方式读取，避免TextIOWrapper开销；增量解码保证多字节字符跨块时不被截断
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            f = await asyncio.to_thread(open, file_path, 'rb', buffering=STREAM_CHUNK_SIZE)
+            try:
+                while True:
+                    raw = await asyncio.to_thread(f.read, STREAM_CHUNK_SIZE)
+                    text = decoder.decode(raw, final=not raw)
+                    if text:
+                        yield json.dumps(text)[1:-1]
+                    if not raw:
+                        break
+            finally:
+                f.close()
+            yield '"}'
         
-    except Exception as e:
-        logger.error(f"Error testing email configuration: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        # 大文件的JSON封装在流式输出时同样按块gzip压缩
+        if _accepts_gzip():
+            response = Response(_gzip_stream(generate()), mimetype='application/json', headers=cache_headers)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+        else:
+            response = Response(generate(), mimetype='application/json', headers=cache_headers)
+        response.vary.add('Accept')
+        return response
+    elif request.method == 'DELETE':
+        file_path = os.path.join(OUTPUT_DIR, filename)
+        if not os.path.exists(file_path):
+            return err('File not found', status=404)
+        await asyncio.to_thread(os.remove, file_path)
+        return ok(message='File deleted')
+
+@app.route('/api/email/test', methods=['POST'])
+@api_endpoint("Error testing email configuration")
+async def test_email_config():
+    """测试邮件配置是否有效"""
+    data = await request.get_json()
+    email_config = data.get('email_config', {})
+    
+    # 检查必要的配置
+    required_fields = ['smtp_server', 'port', 'username', 'password', 'recipient']
+    missing_fields = [field for field in required_fields if not email_config.get(field)]
+    
+    if missing_fields:
+        return err(f'Missing required fields: {", ".join(missing_fields)}', status=400)
+    
+    # 邮件构建类（首次调用时导入并缓存）
+    MIMEText, MIMEMultipart = _mime_classes()
+    
+    # 创建测试邮件
+    msg = MIMEMultipart()
+    msg['From'] = email_config['username']
+    msg['To'] = email_config['recipient']
+    msg['Subject'] = 'arXiv RSS Filter Bot - Email Configuration Test'
+    
+    body = """
+    <html>
+    <body>
+        <h2>Email Configuration Test</h2>
+        <p>This is a test email to verify your email configuration for arXiv RSS Filter Bot.</p>
+        <p>If you received this email, your configuration is working correctly.</p>
+    </body>
+    </html>
+    """
+    
+    msg.attach(MIMEText(body, 'html'))
+    
+    # 发送邮件（复用进程内已认证的SMTP连接）
+    await asyncio.to_thread(
+        _send_email_message(), msg, email_config['smtp_server'], email_config['port'],
+        email_config['username'], email_config['password']
+    )
+    
+    return ok(message=f'Test email sent successfully to {email_config["recipient"]}')
+    
 
 @app.route('/api/status', methods=['GET'])
-def get_status():
+@api_endpoint("Error getting status")
+async def get_status():
     """Get the bot status."""
-    try:
-        status = {
-            'lastRun': None,
-            'paperCount': 0,
-            'latestOutput': None,
-            'papers': []
-        }
+    status = {
+        'lastRun': None,
+        'paperCount': 0,
+        'latestOutput': None,
+        'papers': []
+    }
+    
+    # Check output directory for latest file
+    if os.path.exists(OUTPUT_DIR):
+        entries = await asyncio.to_thread(_scan_dir, OUTPUT_DIR, '.xml')
         
-        # Check output directory for latest file
-        if os.path.exists(OUTPUT_DIR):
-            files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.xml')]
-            files.sort(reverse=True)  # Most recent first
+        if entries:
+            latest_entry = max(entries, key=lambda e: _output_sort_key(e.name))  # Most recent
+            latest_file = latest_entry.name
             
-            if files:
-                latest_file = files[0]
-                status['latestOutput'] = latest_file
-                
-                # Extract date from filename including timestamp if available
-                if 'arxiv_filtered_' in latest_file:
-                    # 尝试提取完整的日期和时间戳
-                    date_part = latest_file.replace('arxiv_filtered_', '').replace('.xml', '')
-                    try:
-                        if '_' in date_part:  # 包含日期和时间
-                            date_str, time_str = date_part.split('_')
-                            # 格式为YYYYMMDD_HHMMSS
-                            full_datetime = datetime.strptime(f"{date_str}_{time_str}", '%Y%m%d_%H%M%S')
-                        else:  # 仅包含日期
-                            date_str = date_part
-                            # 格式为YYYYMMDD，使用当前时间作为时间部分
-                            date_only = datetime.strptime(date_str, '%Y%m%d')
-                            now = datetime.now()
-                            full_datetime = datetime(
-                                year=date_only.year, 
-                                month=date_only.month, 
-                                day=date_only.day,
-                                hour=now.hour,
-                                minute=now.minute,
-                                second=now.second
-                            )
-                        
-                        # 确保返回的时间包含时区信息，这样前端可以正确显示
-                        status['lastRun'] = full_datetime.astimezone().isoformat()
-                    except ValueError as e:
-                        logger.warning(f"无法解析文件名中的日期时间: {e}")
-                        status['lastRun'] = datetime.now().astimezone().isoformat()
-                else:
-                    status['lastRun'] = datetime.now().astimezone().isoformat()
-                
-                # Count papers in the RSS file
+            # 最新文件未变化时直接返回缓存的状态，避免重复解析XML
+            mtime_ns = (await asyncio.to_thread(latest_entry.stat)).st_mtime_ns
+            cache_key = (latest_file, mtime_ns)
+            cache_headers = _cache_headers(f"{latest_file}-{mtime_ns}", mtime_ns / 1e9)
+            if _is_not_modified(cache_headers, mtime_ns / 1e9):
+                return Response('', status=304, headers=cache_headers)
+            if _STATUS_CACHE["key"] == cache_key:
+                return Response(_STATUS_CACHE["value"], mimetype='application/json', headers=cache_headers)
+            
+            status['latestOutput'] = latest_file
+            
+            # Extract date from filename including timestamp if available
+            # 当前本地时间每个请求只计算一次，供各分支复用
+            now = datetime.now().astimezone()
+            m = _FN_RE.match(latest_file)
+            if m:
+                # 正则已保证各段均为定长数字，直接切片转换，避免strptime的格式解析开销
+                date_str, time_str = m.group(1), m.group(2)
                 try:
-                    import xml.etree.ElementTree as ET
-                    tree = ET.parse(os.path.join(OUTPUT_DIR, latest_file))
-                    root = tree.getroot()
-                    items = root.findall('./channel/item')
-                    status['paperCount'] = len(items)
+                    if time_str:  # 包含日期和时间，格式为YYYYMMDD_HHMMSS
+                        full_datetime = datetime(
+                            int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]),
+                            int(time_str[0:2]), int(time_str[2:4]), int(time_str[4:6])
+                        )
+                    else:  # 仅包含日期，使用当前时间作为时间部分
+                        full_datetime = datetime(
+                            int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]),
+                            now.hour, now.minute, now.second
+                        )
                     
-                    # Add full data needed for dashboard
-                    status['papers'] = []
-                    for item in items:
-                        title_elem = item.find('title')
-                        description_elem = item.find('description')
-                        
-                        paper_data = {
-                            'title': title_elem.text if title_elem is not None else 'Untitled',
-                            'keywords': [],
-                        }
-                        
-                        # Extract keywords from description
-                        if description_elem is not None:
-                            desc_text = description_elem.text
-                            keywords_match = None
-                            if desc_text:
-                                keywords_match = desc_text.find('Matched keywords:')
-                                if keywords_match >= 0:
-                                    keywords_text = desc_text[keywords_match + len('Matched keywords:'):].split('.')[0].strip()
-                                    paper_data['keywords'] = [kw.strip() for kw in keywords_text.split(',')]
-                                    
-                        status['papers'].append(paper_data)
-                        
-                except Exception as e:
-                    logger.warning(f"Error extracting paper data: {str(e)}")
-        
-        return jsonify({'success': True, 'status': status})
-    except Exception as e:
-        logger.error(f"Error getting status: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+                    # 确保返回的时间包含时区信息，这样前端可以正确显示
+                    # （astimezone按该日期本身的时区规则计算偏移，跨夏令时也正确）
+                    status['lastRun'] = full_datetime.astimezone().isoformat()
+                except ValueError as e:
+                    logger.warning(f"无法解析文件名中的日期时间: {e}")
+                    status['lastRun'] = now.isoformat()
+            else:
+                status['lastRun'] = now.isoformat()
+            
+            # Count papers in the RSS file
+            try:
+                # Add full data needed for dashboard
+                status['papers'] = await asyncio.to_thread(_extract_rss_papers, os.path.join(OUTPUT_DIR, latest_file))
+                status['paperCount'] = len(status['papers'])
+                    
+            except Exception as e:
+                logger.warning(f"Error extracting paper data: {str(e)}")
+            
+            # 缓存序列化后的响应体，轮询命中时连序列化也省去
+            body = _json_dumps({'success': True, 'status': status})
+            _STATUS_CACHE["key"] = cache_key
+            _STATUS_CACHE["value"] = body
+            return Response(body, mimetype='application/json', headers=cache_headers)
+    
+    return ok(status=status)
 
 @app.route('/api/history', methods=['GET'])
-def list_history():
+@api_endpoint("Error listing history records")
+async def list_history():
     """列出历史记录"""
-    try:
-        # 支持分页
-        page = int(request.args.get('page', 1))
-        per_page = min(int(request.args.get('per_page', 10)), 50)  # 最大50条每页
-        
-        # 获取所有历史记录文件
-        history_files = [f for f in os.listdir(HISTORY_DIR) if f.endswith('.json')]
-        
-        # 按文件修改时间排序（最新在前）
-        history_files.sort(key=lambda f: os.path.getmtime(os.path.join(HISTORY_DIR, f)), reverse=True)
-        
-        # 计算分页
-        total = len(history_files)
-        total_pages = (total - 1) // per_page + 1 if total > 0 else 1
-        
-        # 分页切片
-        start = (page - 1) * per_page
-        end = start + per_page
-        page_files = history_files[start:end]
-        
-        # 读取历史记录元数据
-        records = []
-        for file in page_files:
-            try:
-                with open(os.path.join(HISTORY_DIR, file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 只返回元数据，不包含完整论文列表
-                    summary = {
-                        'id': data.get('id'),
-                        'timestamp': data.get('timestamp'),
-                        'papers_count': data.get('papers_count', 0),
-                        'keywords': data.get('config', {}).get('keywords', []),
-                        'categories': data.get('config', {}).get('categories', []),
-                        'output_file': data.get('output_file')
-                    }
-                    records.append(summary)
-            except Exception as e:
-                logger.error(f"Error reading history file {file}: {str(e)}")
-        
-        return jsonify({
-            'success': True, 
-            'records': records,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages
-            }
-        })
-    except Exception as e:
-        logger.error(f"Error listing history records: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    # 支持分页
+    page = int(request.args.get('page', 1))
+    per_page = min(int(request.args.get('per_page', 10)), 50)  # 最大50条每页
+    
+    # 从索引读取全部摘要（最新在前），无需打开各个历史记录文件
+    index = await asyncio.to_thread(_load_history_index)
+    
+    # 索引文件未变化时同一页的内容也不变，客户端缓存有效则返回304
+    index_mtime_ns, index_size = _HISTORY_INDEX_CACHE["key"]
+    cache_headers = _cache_headers(f"{index_mtime_ns}-{index_size}-{page}-{per_page}", index_mtime_ns / 1e9)
+    if _is_not_modified(cache_headers, index_mtime_ns / 1e9):
+        return Response('', status=304, headers=cache_headers)
+    
+    total = len(index)
+    total_pages = (total - 1) // per_page + 1 if total > 0 else 1
+    
+    # 分页切片
+    start = (page - 1) * per_page
+    records = index[start:start + per_page]
+    
+    response = ok(
+        records=records,
+        pagination={
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': total_pages
+        }
+    )
+    response.headers.update(cache_headers)
+    return response
+
+@app.route('/api/history/reindex', methods=['POST'])
+@api_endpoint("Error rebuilding history index")
+async def rebuild_history_index():
+    """遍历历史记录目录，重建历史记录索引"""
+    count = await asyncio.to_thread(_rebuild_history_index)
+    return ok(message=f'History index rebuilt with {count} records', count=count)
 
 @app.route('/api/history/<record_id>', methods=['GET'])
-def get_history_record(record_id):
+@api_endpoint("Error getting history record")
+async def get_history_record(record_id):
     """获取特定历史记录详情"""
-    try:
-        file_path = os.path.join(HISTORY_DIR, f"{record_id}.json")
-        if not os.path.exists(file_path):
-            return jsonify({'success': False, 'error': 'History record not found'}), 404
-            
-        with open(file_path, 'r', encoding='utf-8') as f:
-            record = json.load(f)
-            
-        return jsonify({'success': True, 'record': record})
-    except Exception as e:
-        logger.error(f"Error getting history record: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    file_path = os.path.join(HISTORY_DIR, f"{record_id}.json")
+    if not os.path.exists(file_path):
+        return err('History record not found', status=404)
+        
+    st = await asyncio.to_thread(os.stat, file_path)
+    cache_headers = _file_cache_headers(st)
+    if _is_not_modified(cache_headers, st.st_mtime):
+        return Response('', status=304, headers=cache_headers)
+    
+    record = await asyncio.to_thread(_read_json_file, file_path)
+    
+    response = ok(record=record)
+    response.headers.update(cache_headers)
+    return response
 
 @app.route('/api/logs', methods=['GET'])
-def get_logs():
+@api_endpoint("Error reading logs")
+async def get_logs():
     """获取日志文件"""
-    try:
-        if not os.path.exists(LOGS_DIR):
-            return jsonify({'success': True, 'logs': []})
-            
-        log_files = [f for f in os.listdir(LOGS_DIR) if f.endswith('.log')]
-        log_files.sort(reverse=True)  # Most recent first
-        
-        # Get most recent log file
-        if not log_files:
-            return jsonify({'success': True, 'logs': []})
-            
-        latest_log = os.path.join(LOGS_DIR, log_files[0])
+    if not os.path.exists(LOGS_DIR):
+        return ok(logs=[])
         
-        with open(latest_log, 'r', encoding='utf-8') as f:
-            log_content = f.read().splitlines()
-            # Return the last 100 lines maximum
-            logs = log_content[-100:] if len(log_content) > 100 else log_content
+    log_files = [e.name for e in await asyncio.to_thread(_scan_dir, LOGS_DIR, '.log')]
+    log_files.sort(reverse=True)  # Most recent first
+    
+    # Get most recent log file
+    if not log_files:
+        return ok(logs=[])
         
-        return jsonify({'success': True, 'logs': logs, 'file': log_files[0]})
-    except Exception as e:
-        logger.error(f"Error reading logs: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    latest_log = os.path.join(LOGS_DIR, log_files[0])
+    
+    # Return the last 100 lines maximum
+    logs = await asyncio.to_thread(_tail_lines, latest_log, 100)
+    
+    return ok(logs=logs, file=log_files[0])
 
 @app.route('/api/subscription/history', methods=['GET'])
-def get_subscription_history():
-    """获取订阅历史记录"""
-    try:
-        SUBSCRIPTION_HISTORY_FILE = os.path.join(BASE_DIR, "subscription_history.json")
-        
-        if not os.path.exists(SUBSCRIPTION_HISTORY_FILE):
-            return jsonify({
-                'success': True, 
-                'history': {
-                    'sent_papers': [],
-                    'last_sent': None,
-                    'count': 0
-                }
-            })
-        
-        with open(SUBSCRIPTION_HISTORY_FILE, 'r', encoding='utf-8') as f:
-            history = json.load(f)
-            
-        # 添加计数
-        history['count'] = len(history.get('sent_papers', []))
-        
-        return jsonify({'success': True, 'history': history})
-    except Exception as e:
-        logger.error(f"Error getting subscription history: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+@api_endpoint("Error getting subscription history")
+async def get_subscription_history():
+    """获取订阅历史记录（快照与增量日志合并后的结果）"""
+    email_sub = await asyncio.to_thread(_email_sub)
+    
+    body = await asyncio.to_thread(
+        _history_with_log_body, email_sub.load_subscription_history,
+        email_sub.SUBSCRIPTION_HISTORY_FILE, email_sub.SUBSCRIPTION_LOG_FILE
+    )
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/conference/run', methods=['POST'])
-def run_conference_pipeline():
+@api_endpoint("Error running conference pipeline")
+async def run_conference_pipeline():
     """触发会议论文获取和推送流程"""
-    try:
-        logger.info("Manual conference pipeline run triggered via API")
-        
-        # 导入会议相关模块
-        from conference_subscription import run_conference_pipeline
-        
-        result = run_conference_pipeline()
+    logger.info("Manual conference pipeline run triggered via API")
+    
+    # 会议相关模块在首次使用时于工作线程中导入，避免阻塞事件循环
+    conf_sub = await asyncio.to_thread(_conf_sub)
+    
+    result = await asyncio.to_thread(conf_sub.run_conference_pipeline)
+    
+    if result:
+        return ok(
+            message='Conference pipeline completed successfully',
+            result=result
+        )
+    else:
+        return ojson({
+            'success': False,
+            'message': 'Conference pipeline completed with no results',
+            'result': result
+        })
         
-        if result:
-            return jsonify({
-                'success': True,
-                'message': 'Conference pipeline completed successfully',
-                'result': result
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Conference pipeline completed with no results',
-                'result': result
-            })
-            
-    except Exception as e:
-        logger.error(f"Error running conference pipeline: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/conference/fetch', methods=['POST'])
-def run_conference_fetch_only():
+@api_endpoint("Error fetching conference papers")
+async def run_conference_fetch_only():
     """仅触发会议论文获取（不推送邮件）"""
-    try:
-        logger.info("Manual conference fetch triggered via API")
-        
-        # 导入会议获取模块
-        from openreview_fetcher import run_conference_fetch
-        
-        result = run_conference_fetch()
+    logger.info("Manual conference fetch triggered via API")
+    
+    # 会议获取模块（首次使用时导入）
+    conf_fetch = await asyncio.to_thread(_conf_fetch)
+    
+    result = await asyncio.to_thread(conf_fetch.run_conference_fetch)
+    
+    if result:
+        return ok(
+            message='Conference papers fetched successfully',
+            result=result
+        )
+    else:
+        return ojson({
+            'success': False,
+            'message': 'Conference fetch completed with no results',
+            'result': result
+        })
         
-        if result:
-            return jsonify({
-                'success': True,
-                'message': 'Conference papers fetched successfully',
-                'result': result
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Conference fetch completed with no results',
-                'result': result
-            })
-            
-    except Exception as e:
-        logger.error(f"Error fetching conference papers: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/conference/subscription', methods=['POST'])
-def run_conference_subscription_only():
+@api_endpoint("Error processing conference subscription")
+async def run_conference_subscription_only():
     """仅触发会议论文订阅推送（基于已有文件）"""
-    try:
-        logger.info("Manual conference subscription triggered via API")
-        
-        # 导入会议订阅模块
-        from conference_subscription import process_conference_subscription
-        
-        result = process_conference_subscription()
+    logger.info("Manual conference subscription triggered via API")
+    
+    # 会议订阅模块（首次使用时导入）
+    conf_sub = await asyncio.to_thread(_conf_sub)
+    
+    result = await asyncio.to_thread(conf_sub.process_conference_subscription)
+    
+    if result:
+        return ok(
+            message='Conference subscription emails sent successfully',
+            result=result
+        )
+    else:
+        return ojson({
+            'success': False,
+            'message': 'Conference subscription completed with no new papers',
+            'result': result
+        })
         
-        if result:
-            return jsonify({
-                'success': True,
-                'message': 'Conference subscription emails sent successfully',
-                'result': result
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Conference subscription completed with no new papers',
-                'result': result
-            })
-            
-    except Exception as e:
-        logger.error(f"Error processing conference subscription: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/conference/output', methods=['GET'])
-def list_conference_output():
+@api_endpoint("Error listing conference output files")
+async def list_conference_output():
     """列出会议论文输出文件"""
-    try:
-        conference_output_dir = os.path.join(BASE_DIR, "conference_output")
-        
-        # 获取所有JSON文件
-        files = []
-        
-        if os.path.exists(conference_output_dir):
-            files = [f for f in os.listdir(conference_output_dir) if f.endswith('.json')]
-        
-        if not files:
-            logger.info("No conference output files found")
-            return jsonify({'success': True, 'files': []})
-            
-        # 按文件修改时间排序，最新的排前面
-        files.sort(key=lambda f: os.path.getmtime(os.path.join(conference_output_dir, f)), reverse=True)
-        
-        logger.info(f"Found {len(files)} conference output files")
-        return jsonify({'success': True, 'files': files})
-    except Exception as e:
-        logger.error(f"Error listing conference output files: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    conference_output_dir = os.path.join(BASE_DIR, "conference_output")
+    
+    # 获取所有JSON文件，按文件修改时间排序，最新的排前面（目录不存在时为空）
+    files = await asyncio.to_thread(_list_files_by_mtime, conference_output_dir, '.json')
+    
+    if not files:
+        logger.info("No conference output files found")
+        return ok(files=[])
+    
+    logger.info(f"Found {len(files)} conference output files")
+    return ok(files=files)
 
 @app.route('/api/conference/output/<filename>', methods=['GET', 'DELETE'])
-def get_conference_output_file(filename):
+@api_endpoint("Error handling conference output file")
+async def get_conference_output_file(filename):
     """获取或删除特定会议论文文件的内容"""
-    try:
-        conference_output_dir = os.path.join(BASE_DIR, "conference_output")
-        file_path = os.path.join(conference_output_dir, filename)
+    conference_output_dir = os.path.join(BASE_DIR, "conference_output")
+    file_path = os.path.join(conference_output_dir, filename)
+    
+    if request.method == 'GET':
+        if not os.path.exists(file_path):
+            return err('File not found', status=404)
         
-        if request.method == 'GET':
-            if not os.path.exists(file_path):
-                return jsonify({'success': False, 'error': 'File not found'}), 404
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-            
-            return jsonify({'success': True, 'filename': filename, 'content': content})
-        elif request.method == 'DELETE':
-            if not os.path.exists(file_path):
-                return jsonify({'success': False, 'error': 'File not found'}), 404
-            os.remove(file_path)
-            return jsonify({'success': True, 'message': 'File deleted'})
-    except Exception as e:
-        logger.error(f"Error handling conference output file: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        # 文件内容本身就是JSON，直接把原始字节拼接进响应，省去解析和重新序列化
+        raw = await asyncio.to_thread(_read_bytes_file, file_path)
+        body = b''.join([
+            b'{"success":true,"filename":', _json_bytes(filename), b',"content":', raw.strip() or b'null', b'}'
+        ])
+        return Response(body, mimetype='application/json')
+    elif request.method == 'DELETE':
+        if not os.path.exists(file_path):
+            return err('File not found', status=404)
+        await asyncio.to_thread(os.remove, file_path)
+        return ok(message='File deleted')
 
 @app.route('/api/conference/subscription/history', methods=['GET'])
-def get_conference_subscription_history():
-    """获取会议订阅历史记录"""
-    try:
-        conference_history_file = os.path.join(BASE_DIR, "conference_subscription_history.json")
-        
-        if not os.path.exists(conference_history_file):
-            return jsonify({
-                'success': True, 
-                'history': {
-                    'sent_papers': [],
-                    'last_sent': None,
-                    'sent_by_conference': {},
-                    'count': 0
-                }
-            })
-        
-        with open(conference_history_file, 'r', encoding='utf-8') as f:
-            history = json.load(f)
-            
-        # 添加计数
-        history['count'] = len(history.get('sent_papers', []))
-        
-        return jsonify({'success': True, 'history': history})
-    except Exception as e:
-        logger.error(f"Error getting conference subscription history: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+@api_endpoint("Error getting conference subscription history")
+async def get_conference_subscription_history():
+    """获取会议订阅历史记录（快照与增量日志合并后的结果）"""
+    # 会议订阅模块（首次使用时导入）
+    conf_sub = await asyncio.to_thread(_conf_sub)
+    
+    body = await asyncio.to_thread(
+        _history_with_log_body, conf_sub.load_conference_subscription_history,
+        conf_sub.CONFERENCE_SUBSCRIPTION_HISTORY_FILE, conf_sub.CONFERENCE_SUBSCRIPTION_LOG_FILE
+    )
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/conference/scheduler/start', methods=['POST'])
-def start_conference_scheduler_api():
-    """启动会议论文调度器"""
-    try:
-        from conference_scheduler import start_conference_scheduler
-        
-        scheduler = start_conference_scheduler()
-        status = scheduler.get_job_status()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Conference scheduler started successfully',
-            'scheduler_status': status
-        })
-    except Exception as e:
-        logger.error(f"Error starting conference scheduler: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+@api_endpoint("Error starting conference scheduler")
+async def start_conference_scheduler_api():
+    """启动会议论文调度器（在当前事件循环上调度，不单独启动调度线程）"""
+    conf_sched = await asyncio.to_thread(_conf_sched)
+    
+    scheduler = await asyncio.to_thread(conf_sched.start_conference_scheduler, asyncio.get_running_loop())
+    status = scheduler.get_job_status()
+    
+    return ok(
+        message='Conference scheduler started successfully',
+        scheduler_status=status
+    )
 
 @app.route('/api/conference/scheduler/stop', methods=['POST'])
-def stop_conference_scheduler_api():
+@api_endpoint("Error stopping conference scheduler")
+async def stop_conference_scheduler_api():
     """停止会议论文调度器"""
-    try:
-        from conference_scheduler import stop_conference_scheduler
-        
-        stop_conference_scheduler()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Conference scheduler stopped successfully'
-        })
-    except Exception as e:
-        logger.error(f"Error stopping conference scheduler: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    conf_sched = await asyncio.to_thread(_conf_sched)
+    
+    await asyncio.to_thread(conf_sched.stop_conference_scheduler)
+    
+    return ok(message='Conference scheduler stopped successfully')
 
 @app.route('/api/conference/scheduler/status', methods=['GET'])
-def get_conference_scheduler_status():
+@api_endpoint("Error getting conference scheduler status")
+async def get_conference_scheduler_status():
     """获取会议论文调度器状态"""
-    try:
-        from conference_scheduler import get_conference_scheduler
-        
-        scheduler = get_conference_scheduler()
-        status = scheduler.get_job_status()
-        
-        return jsonify({
-            'success': True,
-            'scheduler_status': status
-        })
-    except Exception as e:
-        logger.error(f"Error getting conference scheduler status: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    conf_sched = await asyncio.to_thread(_conf_sched)
+    
+    scheduler = await asyncio.to_thread(conf_sched.get_conference_scheduler, asyncio.get_running_loop())
+    status = scheduler.get_job_status()
+    
+    return ok(scheduler_status=status)
 
 @app.route('/api/conference/scheduler/test', methods=['POST'])
-def test_conference_scheduler():
+@api_endpoint("Error testing conference scheduler")
+async def test_conference_scheduler():
     """测试会议论文调度器立即运行"""
-    try:
-        from conference_scheduler import get_conference_scheduler
-        
-        scheduler = get_conference_scheduler()
-        result = scheduler.run_immediate_test()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Conference scheduler test completed',
-            'result': result
-        })
-    except Exception as e:
-        logger.error(f"Error testing conference scheduler: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    conf_sched = await asyncio.to_thread(_conf_sched)
+    
+    scheduler = await asyncio.to_thread(conf_sched.get_conference_scheduler, asyncio.get_running_loop())
+    result = await asyncio.to_thread(scheduler.run_immediate_test)
+    
+    return ok(
+        message='Conference scheduler test completed',
+        result=result
+    )
+
+# API文档内容固定，导入时序列化一次，请求时直接返回字节
+API_DOCS = {
+    'description': 'arXiv RSS Filter Bot API with Conference Extension',
+    'version': '1.1.0',
+    'endpoints': [
+        {
+            'path': '/api/config',
+            'methods': ['GET', 'POST'],
+            'description': 'Get or update configuration'
+        },
+        {
+            'path': '/api/config/reload',
+            'methods': ['POST'],
+            'description': 'Discard the cached configuration and reload it from disk'
+        },
+        {
+            'path': '/api/run',
+            'methods': ['POST'],
+            'description': 'Trigger bot execution (RSS + email) in the background, returns job_id'
+        },
+        {
+            'path': '/api/progress/<job_id>',
+            'methods': ['GET'],
+            'description': 'Server-Sent Events stream of background job progress'
+        },
+        {
+            'path': '/api/run/rss-only',
+            'methods': ['POST'],
+            'description': 'Trigger RSS generation only (no email)'
+        },
+        {
+            'path': '/api/output',
+            'methods': ['GET'],
+            'description': 'List all available output RSS files'
+        },
+        {
+            'path': '/api/output/<filename>',
+            'methods': ['GET', 'DELETE'],
+            'description': 'Get or delete the content of a specific RSS file'
+        },
+        {
+            'path': '/api/logs',
+            'methods': ['GET'],
+            'description': 'Get recent logs'
+        },
+        {
+            'path': '/api/status',
+            'methods': ['GET'],
+            'description': 'Get the bot status'
+        },
+        {
+            'path': '/api/history',
+            'methods': ['GET'],
+            'description': 'List history records'
+        },
+        {
+            'path': '/api/history/reindex',
+            'methods': ['POST'],
+            'description': 'Rebuild the history summary index from the history directory'
+        },
+        {
+            'path': '/api/history/<record_id>',
+            'methods': ['GET'],
+            'description': 'Get history record details'
+        },
+        {
+            'path': '/api/email/test',
+            'methods': ['POST'],
+            'description': 'Test email configuration'
+        },
+        {
+            'path': '/api/subscription/history',
+            'methods': ['GET'],
+            'description': 'Get subscription history'
+        },
+        {
+            'path': '/api/conference/run',
+            'methods': ['POST'],
+            'description': 'Trigger conference paper fetch and subscription pipeline'
+        },
+        {
+            'path': '/api/conference/fetch',
+            'methods': ['POST'],
+            'description': 'Trigger conference paper fetch only'
+        },
+        {
+            'path': '/api/conference/subscription',
+            'methods': ['POST'],
+            'description': 'Trigger conference subscription only'
+        },
+        {
+            'path': '/api/conference/output',
+            'methods': ['GET'],
+            'description': 'List all conference output files'
+        },
+        {
+            'path': '/api/conference/output/<filename>',
+            'methods': ['GET', 'DELETE'],
+            'description': 'Get or delete conference output file'
+        },
+        {
+            'path': '/api/conference/subscription/history',
+            'methods': ['GET'],
+            'description': 'Get conference subscription history'
+        },
+        {
+            'path': '/api/conference/scheduler/start',
+            'methods': ['POST'],
+            'description': 'Start conference paper scheduler'
+        },
+        {
+            'path': '/api/conference/scheduler/stop',
+            'methods': ['POST'],
+            'description': 'Stop conference paper scheduler'
+        },
+        {
+            'path': '/api/conference/scheduler/status',
+            'methods': ['GET'],
+            'description': 'Get conference scheduler status'
+        },
+        {
+            'path': '/api/conference/scheduler/test',
+            'methods': ['POST'],
+            'description': 'Test conference scheduler immediate run'
+        }
+    ]
+}
+_DOCS_BYTES = _json_dumps(API_DOCS)
 
 @app.route('/api/docs', methods=['GET'])
-def get_api_docs():
+async def get_api_docs():
     """API documentation endpoint."""
-    docs = {
-        'description': 'arXiv RSS Filter Bot API with Conference Extension',
-        'version': '1.1.0',
-        'endpoints': [
-            {
-                'path': '/api/config',
-                'methods': ['GET', 'POST'],
-                'description': 'Get or update configuration'
-            },
-            {
-                'path': '/api/run',
-                'methods': ['POST'],
-                'description': 'Trigger bot execution (RSS + email)'
-            },
-            {
-                'path': '/api/run/rss-only',
-                'methods': ['POST'],
-                'description': 'Trigger RSS generation only (no email)'
-            },
-            {
-                'path': '/api/output',
-                'methods': ['GET'],
-                'description': 'List all available output RSS files'
-            },
-            {
-                'path': '/api/output/<filename>',
-                'methods': ['GET', 'DELETE'],
-                'description': 'Get or delete the content of a specific RSS file'
-            },
-            {
-                'path': '/api/logs',
-                'methods': ['GET'],
-                'description': 'Get recent logs'
-            },
-            {
-                'path': '/api/status',
-                'methods': ['GET'],
-                'description': 'Get the bot status'
-            },
-            {
-                'path': '/api/history',
-                'methods': ['GET'],
-                'description': 'List history records'
-            },
-            {
-                'path': '/api/history/<record_id>',
-                'methods': ['GET'],
-                'description': 'Get history record details'
-            },
-            {
-                'path': '/api/email/test',
-                'methods': ['POST'],
-                'description': 'Test email configuration'
-            },
-            {
-                'path': '/api/subscription/history',
-                'methods': ['GET'],
-                'description': 'Get subscription history'
-            },
-            {
-                'path': '/api/conference/run',
-                'methods': ['POST'],
-                'description': 'Trigger conference paper fetch and subscription pipeline'
-            },
-            {
-                'path': '/api/conference/fetch',
-                'methods': ['POST'],
-                'description': 'Trigger conference paper fetch only'
-            },
-            {
-                'path': '/api/conference/subscription',
-                'methods': ['POST'],
-                'description': 'Trigger conference subscription only'
-            },
-            {
-                'path': '/api/conference/output',
-                'methods': ['GET'],
-                'description': 'List all conference output files'
-            },
-            {
-                'path': '/api/conference/output/<filename>',
-                'methods': ['GET', 'DELETE'],
-                'description': 'Get or delete conference output file'
-            },
-            {
-                'path': '/api/conference/subscription/history',
-                'methods': ['GET'],
-                'description': 'Get conference subscription history'
-            },
-            {
-                'path': '/api/conference/scheduler/start',
-                'methods': ['POST'],
-                'description': 'Start conference paper scheduler'
-            },
-            {
-                'path': '/api/conference/scheduler/stop',
-                'methods': ['POST'],
-                'description': 'Stop conference paper scheduler'
-            },
-            {
-                'path': '/api/conference/scheduler/status',
-                'methods': ['GET'],
-                'description': 'Get conference scheduler status'
-            },
-            {
-                'path': '/api/conference/scheduler/test',
-                'methods': ['POST'],
-                'description': 'Test conference scheduler immediate run'
-            }
-        ]
-    }
-    return jsonify(docs)
+    return Response(_DOCS_BYTES, mimetype='application/json')
 
 if __name__ == '__main__':
-    # Start the Flask app
-    app.run(debug=True, host='0.0.0.0', port=8001)
\ No newline at end of file
+    # 使用Hypercorn(ASGI)运行，关闭debug与自动重载
+    # 任务队列(JOBS)、调度器和各类缓存都在进程内，因此只能使用单个worker；
+    # 并发由asyncio事件循环和to_thread线程池提供
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    
+    hypercorn_config = Config()
+    hypercorn_config.bind = [os.environ.get('API_BIND', '0.0.0.0:8001')]
+    hypercorn_config.workers = 1
+    hypercorn_config.accesslog = logging.getLogger('hypercorn.access')
+    hypercorn_config.errorlog = logging.getLogger('hypercorn.error')
+    
+    # 安装了uvloop时使用它作为事件循环（比标准库selector循环更快），否则使用默认循环
+    # 通过事件循环策略安装（uvloop.run 要求 0.18+，策略接口在 requirements 中的最低版本 0.17 里也可用）
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+    asyncio.run(serve(app, hypercorn_config))
\ No newline at end of file
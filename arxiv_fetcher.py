@@ -8,17 +8,384 @@ arXiv RSS 过滤机器人 - 从arXiv API获取论文
 
 import arxiv  # 导入arXiv API客户端库
 import logging  # 导入日志模块
-from datetime import datetime, timedelta  # 导入日期时间模块
+from datetime import datetime, timedelta, timezone  # 导入日期时间模块
 import requests  # 导入请求库，用于发送HTTP请求
-import feedparser  # 导入Feed解析库，用于解析arXiv API的返回结果
+from requests.adapters import HTTPAdapter  # 导入连接池适配器
+from urllib3.util.retry import Retry  # 导入重试策略
+import io  # 导入IO模块，用于把响应字节包装成流
+try:
+    from lxml import etree  # lxml流式解析Atom响应，比feedparser快得多
+except ImportError:  # lxml未安装时回退到标准库
+    import xml.etree.ElementTree as etree
+try:
+    # 可选：libxml2实现的HTML清理器，只在标题/摘要中确实含有HTML标签时使用
+    try:
+        from lxml_html_clean import Cleaner
+    except ImportError:
+        from lxml.html.clean import Cleaner  # lxml 5.2之前的位置
+    _cleaner = Cleaner(scripts=True, javascript=True, links=False, style=True, safe_attrs_only=True)
+except ImportError:
+    _cleaner = None
+try:
+    import ciso8601  # 可选：C实现的ISO 8601解析，比strptime快数十倍
+except ImportError:
+    ciso8601 = None
+import re  # 导入正则模块，用于检测HTML标签
 import urllib.parse  # 导入URL解析库，用于构建查询URL
 import time  # 导入时间模块
+import threading  # 导入线程模块，用于保护全局限速状态
+import json  # 导入JSON模块，用于保存条件请求的验证信息
+import os  # 导入操作系统模块，用于缓存文件读写
+import itertools  # 导入迭代工具模块，用于限制结果数量
+import heapq  # 导入堆模块，用于合并多个已排序的结果
+import hashlib  # 导入哈希模块，用于生成缓存文件名
+from concurrent.futures import ThreadPoolExecutor  # 导入线程池，用于并行获取多个批次
 
 logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器
 
 # 默认的计算机科学类别
 DEFAULT_CATEGORY = "cs"  # cs代表计算机科学(Computer Science)
 
+# arXiv API 地址及请求间隔（arXiv要求每3秒不超过1个请求）
+ARXIV_API_URL = 'https://export.arxiv.org/api/query?'
+ARXIV_REQUEST_INTERVAL = 3.0
+BATCH_FETCH_WORKERS = 4  # 分批获取时的并行批次数
+
+# arXiv响应磁盘缓存：arXiv每天只更新一次，同一天内的重复请求直接读取缓存
+ARXIV_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'arxiv')
+ARXIV_CACHE_TTL = 24 * 3600  # 缓存有效期（秒）
+
+# 条件请求的验证信息：{url: {"etag": ..., "last_modified": ..., "stored_at": ...}}，对应响应体保存在 conditional/ 下
+ARXIV_VALIDATORS_FILE = os.path.join(ARXIV_CACHE_DIR, 'validators.json')
+ARXIV_VALIDATORS_MAX = 256  # 最多记录的URL数，超出时淘汰最久未更新的
+ARXIV_VALIDATORS_TTL = 7 * 24 * 3600  # 验证信息的有效期（秒）
+_validators = None
+_validators_lock = threading.Lock()
+
+# 判断文本中是否含有HTML标签（区分数学公式中的 "<" 比较符号）
+_HTML_TAG_RE = re.compile(r'</?[a-zA-Z][^>]*>')
+
+# Atom命名空间下的标签名
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_ATOM_ENTRY = _ATOM + 'entry'
+
+# 全局限速状态：所有分页/分批请求共享同一个时间间隔，而不是每页固定sleep
+_rate_lock = threading.Lock()
+_last_request_time = 0.0
+
+def _wait_for_rate_limit():
+    """等待到距离上一次请求至少 ARXIV_REQUEST_INTERVAL 秒"""
+    global _last_request_time
+    with _rate_lock:
+        wait = _last_request_time + ARXIV_REQUEST_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request_time = time.monotonic()
+
+def _parse_dt(value):
+    """
+    解析arXiv的 YYYY-MM-DDTHH:MM:SSZ 时间戳，返回naive datetime（与原strptime结果一致）
+    
+    Raises:
+        ValueError: 格式不符时
+    """
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime_as_naive(value)
+    # 固定格式直接切片转换，避免strptime的格式解析开销
+    if len(value) != 20 or value[4] != '-' or value[7] != '-' or value[10] != 'T' or value[13] != ':' or value[16] != ':' or value[19] != 'Z':
+        raise ValueError(f"time data {value!r} does not match format '%Y-%m-%dT%H:%M:%SZ'")
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]))
+
+def _parse_atom_stream(xml_bytes):
+    """
+    流式解析arXiv API返回的Atom文档，只提取需要的字段
+    
+    Returns:
+        list: 条目字典列表，包含 id、title、summary、published、updated（存在时）、authors、categories
+    """
+    entries = []
+    for _, entry in etree.iterparse(io.BytesIO(xml_bytes), events=('end',)):
+        if entry.tag != _ATOM_ENTRY:
+            continue
+        item = {
+            'id': entry.findtext(_ATOM + 'id', ''),
+            'title': entry.findtext(_ATOM + 'title', ''),
+            'summary': entry.findtext(_ATOM + 'summary', ''),
+            'authors': [author.findtext(_ATOM + 'name', '') for author in entry.iterfind(_ATOM + 'author')],
+            'categories': [category.get('term', '') for category in entry.iterfind(_ATOM + 'category')],
+        }
+        for field in ('published', 'updated'):
+            value = entry.findtext(_ATOM + field)
+            if value is not None:
+                item[field] = value
+        entries.append(item)
+        
+        # 释放已处理的条目，内存占用与条目数量无关
+        entry.clear()
+        if hasattr(entry, 'getprevious'):
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+    return entries
+
+def _clean_html(text):
+    """清理文本中的HTML（去除脚本、样式等）；没有清理器或不含标签时原样返回"""
+    if _cleaner is None or not text or not _HTML_TAG_RE.search(text):
+        return text
+    return _cleaner.clean_html(text)
+
+def _entries_to_papers(entries):
+    """把 _parse_atom_stream 返回的条目转换为标准论文字典"""
+    parse_dt = _parse_dt
+    clean_html = _clean_html
+    pdf_url = "https://arxiv.org/pdf/{}.pdf".format
+    papers = [None] * len(entries)
+    for i, entry in enumerate(entries):
+        entry_id = entry['id']
+        short_id = entry_id.rsplit('/', 1)[-1]
+        categories = entry['categories']
+        
+        # 提取日期
+        published = None
+        updated = None
+        try:
+            if 'published' in entry:
+                published = parse_dt(entry['published'])
+            if 'updated' in entry:
+                updated = parse_dt(entry['updated'])
+        except ValueError as e:
+            logger.warning(f"Date parsing error for entry {entry_id}: {e}")
+            # 使用当前时间作为后备（与截止时间一样取naive的UTC时间）
+            if not published:
+                published = datetime.now(timezone.utc).replace(tzinfo=None)
+            if not updated:
+                updated = published
+        
+        papers[i] = {
+            'id': short_id,
+            'title': clean_html(entry['title']),
+            'authors': entry['authors'],
+            'summary': clean_html(entry['summary']),
+            'published': published,
+            'updated': updated,
+            'pdf_url': pdf_url(short_id),
+            'entry_id': entry_id,
+            'categories': categories,
+            'primary_category': categories[0] if categories else None,
+        }
+    return papers
+
+def _cache_path(url):
+    """缓存文件路径：以 (URL, 当天日期) 的哈希作为文件名"""
+    key = f"{url}|{datetime.now().date().isoformat()}".encode('utf-8')
+    return os.path.join(ARXIV_CACHE_DIR, hashlib.blake2b(key, digest_size=16).hexdigest() + '.xml')
+
+def _cache_get(url):
+    """读取未过期的缓存响应，不存在或已过期时返回None"""
+    path = _cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) > ARXIV_CACHE_TTL:
+            os.remove(path)  # 过期缓存直接删除
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _sweep_cache():
+    """删除超过有效期的缓存文件；缓存键含日期，过期条目不会再被读到，需要主动清理"""
+    cutoff = time.time() - ARXIV_CACHE_TTL
+    removed = 0
+    try:
+        with os.scandir(ARXIV_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.xml') and entry.is_file() and entry.stat().st_mtime < cutoff:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+    except OSError:
+        return  # 缓存目录还不存在
+    if removed:
+        logger.info(f"Removed {removed} expired arXiv cache files")
+
+def _write_atomic(path, content):
+    """先写临时文件再替换，避免并发读到半个文件"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def _cache_put(url, content):
+    """写入缓存"""
+    try:
+        _write_atomic(_cache_path(url), content)
+    except OSError as e:
+        logger.warning(f"Failed to write arXiv cache: {str(e)}")
+
+def _load_validators():
+    """读取各URL的 ETag / Last-Modified 记录（首次调用时从磁盘加载）"""
+    global _validators
+    if _validators is None:
+        try:
+            with open(ARXIV_VALIDATORS_FILE, 'r', encoding='utf-8') as f:
+                _validators = json.load(f)
+        except (OSError, ValueError):
+            _validators = {}
+    return _validators
+
+def _conditional_body_path(url):
+    """条件请求对应的响应体文件（按URL哈希，不含日期，跨天有效）"""
+    return os.path.join(ARXIV_CACHE_DIR, 'conditional', hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest() + '.xml')
+
+def _conditional_headers(url):
+    """根据上次响应的验证信息构建 If-None-Match / If-Modified-Since 请求头"""
+    with _validators_lock:
+        meta = _load_validators().get(url)
+    if not meta or not os.path.exists(_conditional_body_path(url)):
+        return {}
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def _prune_validators(validators):
+    """删除过期或超出数量上限的验证信息及其响应体（调用方持有 _validators_lock）"""
+    cutoff = time.time() - ARXIV_VALIDATORS_TTL
+    stale = [u for u, meta in validators.items() if meta.get('stored_at', 0) < cutoff]
+    excess = len(validators) - len(stale) - ARXIV_VALIDATORS_MAX
+    if excess > 0:
+        stale += [u for u in validators if u not in stale][:excess]
+    for u in stale:
+        del validators[u]
+        try:
+            os.remove(_conditional_body_path(u))
+        except OSError:
+            pass
+
+def _store_validators(url, response):
+    """
+    保存200响应的验证信息和响应体
+    
+    响应不带ETag/Last-Modified时不记录；包含submittedDate范围的分批查询URL每次都不同，
+    条件请求没有意义，也不记录。记录按更新时间淘汰，数量和有效期都有上限
+    """
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if (not etag and not last_modified) or 'submittedDate' in url:
+        return
+    try:
+        _write_atomic(_conditional_body_path(url), response.content)
+        with _validators_lock:
+            validators = _load_validators()
+            validators.pop(url, None)  # 重新插入到末尾，字典顺序即更新顺序
+            validators[url] = {'etag': etag, 'last_modified': last_modified, 'stored_at': time.time()}
+            _prune_validators(validators)
+            _write_atomic(ARXIV_VALIDATORS_FILE, json.dumps(validators).encode('utf-8'))
+    except OSError as e:
+        logger.warning(f"Failed to write arXiv validators: {str(e)}")
+
+def _create_session():
+    """创建复用TCP/TLS连接的会话，由urllib3负责指数退避重试"""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=2,  # 指数退避，429响应时遵循Retry-After头
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False  # 重试耗尽后返回最后的响应，由raise_for_status抛出HTTPError
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# 所有分页/分批请求共享同一个会话，避免每页重新握手
+_session = _create_session()
+
+def _query_url_prefix(search_query):
+    """构建不含分页参数的查询URL前缀"""
+    return ARXIV_API_URL + urllib.parse.urlencode({
+        'search_query': search_query,
+        'sortBy': 'submittedDate',
+        'sortOrder': 'descending'
+    })
+
+def _request_page(url):
+    """
+    请求一页arXiv API结果，带磁盘缓存、全局限速和重试
+    
+    Returns:
+        bytes: 响应内容
+    """
+    # 命中缓存时既不访问网络也不需要限速等待
+    cached = _cache_get(url)
+    if cached is not None:
+        logger.info(f"Using cached arXiv response for {url}")
+        return cached
+    
+    _wait_for_rate_limit()
+    try:
+        # 带上次的ETag/Last-Modified发送条件请求，内容未变化时服务器返回304，不重新传输响应体
+        response = _session.get(url, timeout=30, headers=_conditional_headers(url))
+        if response.status_code == 304:
+            try:
+                with open(_conditional_body_path(url), 'rb') as f:
+                    content = f.read()
+                logger.info(f"arXiv response not modified for {url}")
+                _cache_put(url, content)
+                return content
+            except OSError:
+                # 本地响应体丢失，重新发送普通请求
+                _wait_for_rate_limit()
+                response = _session.get(url, timeout=30)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch from arXiv: {str(e)}")
+        raise
+    _cache_put(url, response.content)
+    _store_validators(url, response)
+    return response.content
+
+# arxiv库内部的Atom解析模块（较旧版本的arxiv库没有该模块，此时不使用缓存）
+_arxiv_feed = getattr(arxiv, '_feed', None)
+
+class _CachingArxivClient(arxiv.Client):
+    """带磁盘缓存的arxiv.Client：命中缓存的分页直接解析，不发请求，也不计入delay_seconds"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _arxiv_feed is not None:
+            # 成功的响应写入与直接请求方式共用的磁盘缓存
+            self._session.hooks['response'].append(self._store_response)
+    
+    @staticmethod
+    def _store_response(response, *args, **kwargs):
+        if response.status_code == 200:
+            _cache_put(response.request.url, response.content)
+    
+    def _parse_feed(self, url, first_page=True, **kwargs):
+        # 其余参数（arxiv 2.x之后的重试计数_try_index等）原样转给基类，arxiv 1.x不传
+        if _arxiv_feed is not None:
+            cached = _cache_get(url)
+            if cached is not None:
+                feed = _arxiv_feed.parse(cached)
+                if feed.results or first_page:
+                    logger.info(f"Using cached arXiv response for {url}")
+                    return feed
+        return super()._parse_feed(url, first_page=first_page, **kwargs)
+
+# 模块级单例客户端，多次调用之间共享会话和请求间隔状态
+_ARXIV_CLIENT = _CachingArxivClient(
+    page_size=100,  # 每页100篇论文
+    delay_seconds=3.0,  # API请求之间延迟3秒，避免过于频繁请求
+    num_retries=5  # 失败时最多重试5次
+)
+
 def fetch_latest_papers(config):
     """
     从arXiv获取最新论文
@@ -27,6 +394,7 @@ def fetch_latest_papers(config):
         config (dict): 包含以下键的配置字典:
             - categories: 要获取的arXiv类别列表
             - max_results: 要获取的最大论文数量
+            - per_category_fetch: 可选，为True时每个类别单独查询后合并
             
     Returns:
         list: 论文字典列表，每个字典包含论文的详细信息
@@ -40,20 +408,101 @@ def fetch_latest_papers(config):
         logger.info(f"Fetching papers from arXiv for categories: {', '.join(categories)}")
         logger.info(f"Max results: {max_results}, Max days old: {max_days_old}")
         
-        # 方法1: 直接使用arxiv库
+        # 每次获取前清理过期的响应缓存
+        _sweep_cache()
+        
+        # 可选：每个类别单独查询（单个cat:条件），避免大型OR查询
+        if config.get('per_category_fetch', False) and len(categories) > 1:
+            return _fetch_per_category(categories, max_results, max_days_old)
+        
+        # 方法1: 直接使用arxiv库（边迭代边写入partial，失败时保留已获取的部分）
+        partial = []
         try:
-            return _fetch_via_arxiv_lib(categories, max_results, max_days_old)
+            return _fetch_via_arxiv_lib(categories, max_results, max_days_old, out=partial)
         except Exception as e:
             logger.warning(f"使用arxiv库获取失败，尝试备用方法: {str(e)}")
-            # 如果arxiv库失败，使用备用方法
-            return _fetch_via_feedparser(categories, max_results, max_days_old)
+            # 如果arxiv库失败，使用备用方法，从已获取的数量处继续，避免重复下载
+            if partial:
+                logger.info(f"Resuming from offset {len(partial)} with {len(partial)} papers already fetched")
+            rest = _fetch_via_feedparser(categories, max_results, max_days_old, start_offset=len(partial))
+            return _merge_partial(partial, rest)
             
     except Exception as e:  # 捕获所有可能的异常
         logger.error(f"Error fetching papers from arXiv: {str(e)}", exc_info=True)  # 记录错误详情
         raise  # 重新抛出异常，让调用者处理
 
-def _fetch_via_arxiv_lib(categories, max_results, max_days_old=30):
-    """使用arxiv库获取论文"""
+def _fetch_per_category(categories, max_results, max_days_old):
+    """
+    每个类别单独查询并按发布时间合并
+    
+    各类别在线程池中并行获取（请求仍经过全局限速）；跨类别交叉发布的论文按ID去重
+    
+    Returns:
+        list: 按发布时间降序排列的论文字典列表
+    """
+    logger.info(f"Fetching {len(categories)} categories separately")
+    per_category_max = max(1, max_results // len(categories))
+    with ThreadPoolExecutor(max_workers=min(BATCH_FETCH_WORKERS, len(categories))) as executor:
+        # 各类别只获取分配到的数量，不按max_days_old放大
+        futures = [executor.submit(_fetch_via_feedparser, [category], per_category_max, max_days_old, expand_limit=False)
+                   for category in categories]
+        results = [future.result() for future in futures]
+    
+    # 每个类别的结果已按提交日期降序，多路归并即可得到整体降序
+    papers = []
+    seen_ids = set()
+    for paper in heapq.merge(*results, key=lambda p: p['published'] or datetime.min, reverse=True):
+        if paper['id'] not in seen_ids:
+            seen_ids.add(paper['id'])
+            papers.append(paper)
+            if len(papers) >= max_results:
+                break
+    
+    logger.info(f"Successfully fetched {len(papers)} papers from {len(categories)} categories")
+    return papers
+
+def _merge_partial(partial, rest):
+    """
+    合并arxiv库已获取的部分结果与备用方法的结果
+    
+    两次查询之间可能有新论文提交导致偏移错位，因此按ID去重；
+    arxiv库返回带时区的时间，备用方法返回naive UTC时间，合并时统一为带时区，保证可以互相比较排序
+    """
+    if not partial:
+        return rest
+    seen_ids = {paper['id'] for paper in partial}
+    merged = list(partial)
+    for paper in rest:
+        if paper['id'] in seen_ids:
+            continue
+        for field in ('published', 'updated'):
+            if paper.get(field) and paper[field].tzinfo is None:
+                paper[field] = paper[field].replace(tzinfo=timezone.utc)
+        merged.append(paper)
+    return merged
+
+def _result_to_dict(paper):
+    """把 arxiv.Result 转换为标准论文字典"""
+    return {
+        'id': paper.entry_id.rsplit('/', 1)[-1],  # 提取论文ID
+        'title': paper.title,  # 论文标题
+        'authors': [author.name for author in paper.authors],  # 作者列表
+        'summary': paper.summary,  # 论文摘要
+        'published': paper.published,  # 发布时间
+        'updated': paper.updated,  # 更新时间
+        'pdf_url': paper.pdf_url,  # PDF下载链接
+        'entry_id': paper.entry_id,  # 完整的条目ID
+        'categories': paper.categories,  # 论文所属类别
+        'primary_category': paper.primary_category,  # 主要类别
+    }
+
+def _fetch_via_arxiv_lib(categories, max_results, max_days_old=30, out=None):
+    """
+    使用arxiv库获取论文
+    
+    Args:
+        out (list): 可选，结果逐条追加到该列表中；抛出异常时调用者仍可拿到已获取的部分
+    """
     # 创建类别查询字符串
     search_query = " OR ".join([f"cat:{cat}" for cat in categories])  # 构建类别查询，例如："cat:cs.AI OR cat:cs.LG"
     
@@ -64,12 +513,8 @@ def _fetch_via_arxiv_lib(categories, max_results, max_days_old=30):
     actual_max_results = min(10000, max(max_results, max_days_old * len(categories) * papers_per_day_per_category))
     logger.info(f"Increasing fetch limit to {actual_max_results} to ensure coverage for {max_days_old} days")
     
-    # 设置客户端
-    client = arxiv.Client(
-        page_size=100,  # 每页100篇论文
-        delay_seconds=3.0,  # API请求之间延迟3秒，避免过于频繁请求
-        num_retries=5  # 失败时最多重试5次
-    )
+    # 复用模块级客户端（已缓存的分页不发请求，也不等待请求间隔）
+    client = _ARXIV_CLIENT
     
     # 创建搜索对象
     search = arxiv.Search(
@@ -79,37 +524,30 @@ def _fetch_via_arxiv_lib(categories, max_results, max_days_old=30):
         sort_order=arxiv.SortOrder.Descending  # 降序排序，最新的论文排在前面
     )
     
-    # 执行查询并获取结果
-    results = list(client.results(search))
-    logger.info(f"Successfully fetched {len(results)} papers from arXiv using arxiv library")
-    
-    # 转换为标准格式
-    papers = []
-    for paper in results:
-        papers.append({
-            'id': paper.entry_id.split('/')[-1],  # 提取论文ID
-            'title': paper.title,  # 论文标题
-            'authors': [author.name for author in paper.authors],  # 作者列表
-            'summary': paper.summary,  # 论文摘要
-            'published': paper.published,  # 发布时间
-            'updated': paper.updated,  # 更新时间
-            'pdf_url': paper.pdf_url,  # PDF下载链接
-            'entry_id': paper.entry_id,  # 完整的条目ID
-            'categories': paper.categories,  # 论文所属类别
-            'primary_category': paper.primary_category,  # 主要类别
-        })
+    # 执行查询，边迭代边转换为标准格式（不物化Result列表，每个Result转换后即可回收）
+    papers = out if out is not None else []
+    append = papers.append
+    for result in itertools.islice(client.results(search), actual_max_results):
+        append(_result_to_dict(result))
+    logger.info(f"Successfully fetched {len(papers)} papers from arXiv using arxiv library")
     
     return papers
 
-def _fetch_via_feedparser(categories, max_results, max_days_old=30):
-    """使用feedparser直接获取arXiv API结果"""
-    # 构建arXiv API URL
-    base_url = 'https://export.arxiv.org/api/query?'
+def _fetch_via_feedparser(categories, max_results, max_days_old=30, start_offset=0, expand_limit=True):
+    """
+    直接请求arXiv API并流式解析结果（不经过arxiv库）
     
-    # 根据max_days_old增加获取数量
-    papers_per_day_per_category = 20  # 增加每类别每天的估计论文数
-    actual_max_results = min(10000, max(max_results, max_days_old * len(categories) * papers_per_day_per_category))
-    logger.info(f"Increasing fetch limit to {actual_max_results} to ensure coverage for {max_days_old} days")
+    Args:
+        start_offset (int): 从该偏移开始分页（跳过已通过其他方式获取的结果）
+        expand_limit (bool): 为True时按max_days_old放大获取数量；为False时最多获取max_results篇
+    """
+    if expand_limit:
+        # 根据max_days_old增加获取数量
+        papers_per_day_per_category = 20  # 增加每类别每天的估计论文数
+        actual_max_results = min(10000, max(max_results, max_days_old * len(categories) * papers_per_day_per_category))
+        logger.info(f"Increasing fetch limit to {actual_max_results} to ensure coverage for {max_days_old} days")
+    else:
+        actual_max_results = max_results
     
     # 构建查询参数
     search_query = " OR ".join([f"cat:{cat}" for cat in categories])
@@ -121,51 +559,34 @@ def _fetch_via_feedparser(categories, max_results, max_days_old=30):
     all_papers = []
     page_size = 100  # arXiv API每次请求最大返回数量
     
+    # 查询参数中不随页变化的部分只编码一次
+    url_prefix = _query_url_prefix(search_query)
+    
+    # 时间范围截止点（arXiv时间为UTC，与解析出的naive时间保持一致）
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=max_days_old)
+    
     # 分页请求数据，避免单次请求数据过多
-    for start in range(0, actual_max_results, page_size):
+    for start in range(start_offset, actual_max_results, page_size):
         try:
             # 如果已经获取足够的论文，停止请求
-            if len(all_papers) >= actual_max_results:
+            if start_offset + len(all_papers) >= actual_max_results:
                 break
                 
-            # 构建本次请求的参数
-            params = {
-                'search_query': search_query,
-                'sortBy': 'submittedDate',
-                'sortOrder': 'descending',
-                'start': start,
-                'max_results': min(page_size, actual_max_results - start)
-            }
-            
-            # 构建完整的URL
-            url = base_url + urllib.parse.urlencode(params)
+            # 构建完整的URL（只拼接随页变化的参数）
+            url = f"{url_prefix}&start={start}&max_results={min(page_size, actual_max_results - start)}"
             logger.info(f"Requesting arXiv API: {url}")
             
-            # 发送HTTP请求，带重试机制
-            max_retries = 3
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    response = requests.get(url, timeout=30)
-                    response.raise_for_status()
-                    break
-                except (requests.RequestException, requests.Timeout) as e:
-                    retry_count += 1
-                    wait_time = 2 ** retry_count  # 指数退避
-                    logger.warning(f"Request failed (attempt {retry_count}/{max_retries}): {str(e)}. Retrying in {wait_time}s...")
-                    if retry_count >= max_retries:
-                        logger.error(f"Failed to fetch from arXiv after {max_retries} attempts: {str(e)}")
-                        raise
-                    time.sleep(wait_time)
+            # 发送HTTP请求（带全局限速和重试）
+            content = _request_page(url)
             
-            # 解析返回的Feed
-            feed = feedparser.parse(response.content)
+            # 流式解析返回的Atom文档
+            entries = _parse_atom_stream(content)
             
             # 检查是否有条目返回
-            if not feed.entries:
+            if not entries:
                 logger.warning(f"No entries returned for request starting at {start}")
                 # 如果是第一个请求就没有结果，可能是查询有问题
-                if start == 0:
+                if start == start_offset:
                     logger.error("First page returned no results, check query parameters")
                     break
                 else:
@@ -173,57 +594,76 @@ def _fetch_via_feedparser(categories, max_results, max_days_old=30):
                     logger.info("No more entries available, stopping pagination")
                     break
             
-            # 处理返回的条目
-            for entry in feed.entries:
-                # 提取作者信息
-                authors = [author.get('name', '') for author in entry.get('authors', [])]
-                
-                # 提取分类信息
-                categories = [tag.get('term', '') for tag in entry.get('tags', [])]
-                
-                # 提取日期
-                published = None
-                updated = None
-                try:
-                    if 'published' in entry:
-                        published = datetime.strptime(entry.published, "%Y-%m-%dT%H:%M:%SZ")
-                    if 'updated' in entry:
-                        updated = datetime.strptime(entry.updated, "%Y-%m-%dT%H:%M:%SZ")
-                except ValueError as e:
-                    logger.warning(f"Date parsing error for entry {entry.id}: {e}")
-                    # 使用当前时间作为后备
-                    if not published:
-                        published = datetime.now()
-                    if not updated:
-                        updated = published
-                
-                # 构建论文对象
-                paper = {
-                    'id': entry.id.split('/')[-1],
-                    'title': entry.title,
-                    'authors': authors,
-                    'summary': entry.summary if 'summary' in entry else '',
-                    'published': published,
-                    'updated': updated,
-                    'pdf_url': f"https://arxiv.org/pdf/{entry.id.split('/')[-1]}.pdf",
-                    'entry_id': entry.id,
-                    'categories': categories,
-                    'primary_category': categories[0] if categories else None,
-                }
-                
-                all_papers.append(paper)
+            # 转换为标准格式
+            page_papers = _entries_to_papers(entries)
+            all_papers.extend(page_papers)
             
-            # API限速，避免请求过快
-            time.sleep(3)
+            # 结果按提交日期降序排列，本页最旧的论文已超出时间范围时，后续分页只会更旧
+            last_published = page_papers[-1]['published']
+            if last_published and last_published < cutoff:
+                logger.info(f"Reached cutoff date after {len(all_papers)} papers, stopping pagination")
+                break
             
         except Exception as e:
             logger.error(f"Error fetching papers from arXiv at offset {start}: {str(e)}")
             # 继续尝试下一个分页，而不是完全中断
             time.sleep(5)  # 出错后等待更长时间再重试
     
-    logger.info(f"Successfully fetched {len(all_papers)} papers from arXiv using feedparser")
+    logger.info(f"Successfully fetched {len(all_papers)} papers from arXiv API")
     return all_papers
 
+def _fetch_batch(search_query_base, batch, num_batches, now, batch_days, max_days_old, batch_max_results):
+    """获取单个日期批次内的论文（在线程池中执行，请求仍经过全局限速）"""
+    # 计算当前批次的日期范围
+    end_date = now - timedelta(days=batch * batch_days)
+    start_date = now - timedelta(days=min(max_days_old, (batch + 1) * batch_days))
+    
+    logger.info(f"Fetching batch {batch+1}/{num_batches}: {start_date.date()} to {end_date.date()}")
+    
+    # 构建日期范围查询
+    date_query = f" AND submittedDate:[{start_date.strftime('%Y%m%d')}000000 TO {end_date.strftime('%Y%m%d')}235959]"
+    search_query = search_query_base + date_query
+    
+    # 获取当前批次的论文
+    batch_papers = []
+    page_size = 100
+    
+    # 查询参数中不随页变化的部分只编码一次
+    url_prefix = _query_url_prefix(search_query)
+    
+    # 分页请求数据
+    for start in range(0, batch_max_results, page_size):
+        try:
+            # 如果已经获取足够的论文，停止请求
+            if len(batch_papers) >= batch_max_results:
+                break
+                
+            # 构建完整的URL（只拼接随页变化的参数）
+            url = f"{url_prefix}&start={start}&max_results={min(page_size, batch_max_results - start)}"
+            logger.info(f"Requesting arXiv API for batch {batch+1}: {url}")
+            
+            # 发送HTTP请求（带全局限速和重试）
+            content = _request_page(url)
+            
+            # 流式解析返回的Atom文档
+            entries = _parse_atom_stream(content)
+            
+            # 检查是否有条目返回
+            if not entries:
+                logger.warning(f"No entries returned for batch {batch+1} request starting at {start}")
+                break
+            
+            # 转换为标准格式
+            batch_papers.extend(_entries_to_papers(entries))
+            
+        except Exception as e:
+            logger.error(f"Error fetching papers for batch {batch+1} at offset {start}: {str(e)}")
+            time.sleep(5)  # 出错后等待更长时间再重试
+    
+    logger.info(f"Fetched {len(batch_papers)} papers for batch {batch+1}")
+    return batch_papers
+
+
 def _fetch_in_batches(categories, max_results, max_days_old):
     """
     分批获取论文，适用于获取较长时间范围的论文
@@ -246,128 +686,31 @@ def _fetch_in_batches(categories, max_results, max_days_old):
     # 每批获取的论文数量
     batch_max_results = max(100, max_results // num_batches)
     
-    # 构建arXiv API URL
-    base_url = 'https://export.arxiv.org/api/query?'
-    
     # 构建基本查询参数
     search_query_base = " OR ".join([f"cat:{cat}" for cat in categories])
     
-    # 分批获取
+    # 分批获取：各批次在线程池中并行执行，一个批次解析Feed时另一个批次可以发出请求
     now = datetime.now()
-    for batch in range(num_batches):
-        # 计算当前批次的日期范围
-        end_date = now - timedelta(days=batch * batch_days)
-        start_date = now - timedelta(days=min(max_days_old, (batch + 1) * batch_days))
-        
-        logger.info(f"Fetching batch {batch+1}/{num_batches}: {start_date.date()} to {end_date.date()}")
-        
-        # 构建日期范围查询
-        date_query = f" AND submittedDate:[{start_date.strftime('%Y%m%d')}000000 TO {end_date.strftime('%Y%m%d')}235959]"
-        search_query = search_query_base + date_query
-        
-        # 获取当前批次的论文
-        batch_papers = []
-        page_size = 100
-        
-        # 分页请求数据
-        for start in range(0, batch_max_results, page_size):
-            try:
-                # 如果已经获取足够的论文，停止请求
-                if len(batch_papers) >= batch_max_results:
-                    break
-                    
-                # 构建本次请求的参数
-                params = {
-                    'search_query': search_query,
-                    'sortBy': 'submittedDate',
-                    'sortOrder': 'descending',
-                    'start': start,
-                    'max_results': min(page_size, batch_max_results - start)
-                }
-                
-                # 构建完整的URL
-                url = base_url + urllib.parse.urlencode(params)
-                logger.info(f"Requesting arXiv API for batch {batch+1}: {url}")
-                
-                # 发送HTTP请求，带重试机制
-                max_retries = 3
-                retry_count = 0
-                while retry_count < max_retries:
-                    try:
-                        response = requests.get(url, timeout=30)
-                        response.raise_for_status()
-                        break
-                    except (requests.RequestException, requests.Timeout) as e:
-                        retry_count += 1
-                        wait_time = 2 ** retry_count  # 指数退避
-                        logger.warning(f"Request failed (attempt {retry_count}/{max_retries}): {str(e)}. Retrying in {wait_time}s...")
-                        if retry_count >= max_retries:
-                            logger.error(f"Failed to fetch from arXiv after {max_retries} attempts: {str(e)}")
-                            raise
-                        time.sleep(wait_time)
-                
-                # 解析返回的Feed
-                feed = feedparser.parse(response.content)
-                
-                # 检查是否有条目返回
-                if not feed.entries:
-                    logger.warning(f"No entries returned for batch {batch+1} request starting at {start}")
-                    break
-                
-                # 处理返回的条目
-                for entry in feed.entries:
-                    # 提取作者信息
-                    authors = [author.get('name', '') for author in entry.get('authors', [])]
-                    
-                    # 提取分类信息
-                    categories = [tag.get('term', '') for tag in entry.get('tags', [])]
-                    
-                    # 提取日期
-                    published = None
-                    updated = None
-                    try:
-                        if 'published' in entry:
-                            published = datetime.strptime(entry.published, "%Y-%m-%dT%H:%M:%SZ")
-                        if 'updated' in entry:
-                            updated = datetime.strptime(entry.updated, "%Y-%m-%dT%H:%M:%SZ")
-                    except ValueError as e:
-                        logger.warning(f"Date parsing error for entry {entry.id}: {e}")
-                        # 使用当前时间作为后备
-                        if not published:
-                            published = datetime.now()
-                        if not updated:
-                            updated = published
-                    
-                    # 构建论文对象
-                    paper = {
-                        'id': entry.id.split('/')[-1],
-                        'title': entry.title,
-                        'authors': authors,
-                        'summary': entry.summary if 'summary' in entry else '',
-                        'published': published,
-                        'updated': updated,
-                        'pdf_url': f"https://arxiv.org/pdf/{entry.id.split('/')[-1]}.pdf",
-                        'entry_id': entry.id,
-                        'categories': categories,
-                        'primary_category': categories[0] if categories else None,
-                    }
-                    
-                    batch_papers.append(paper)
-                
-                # API限速，避免请求过快
-                time.sleep(3)
-                
-            except Exception as e:
-                logger.error(f"Error fetching papers for batch {batch+1} at offset {start}: {str(e)}")
-                time.sleep(5)  # 出错后等待更长时间再重试
-        
-        logger.info(f"Fetched {len(batch_papers)} papers for batch {batch+1}")
-        all_papers.extend(batch_papers)
-        
-        # 如果已经获取足够的论文，停止请求
-        if len(all_papers) >= max_results:
-            logger.info(f"Reached maximum results limit ({max_results}), stopping batch fetching")
-            break
+    with ThreadPoolExecutor(max_workers=min(BATCH_FETCH_WORKERS, num_batches)) as executor:
+        futures = [
+            executor.submit(_fetch_batch, search_query_base, batch, num_batches, now,
+                            batch_days, max_days_old, batch_max_results)
+            for batch in range(num_batches)
+        ]
+        # 按批次顺序（从新到旧）汇总结果；相邻批次的日期边界重叠，按ID去重，保留最先出现（最新）的条目
+        seen_ids = set()
+        for future in futures:
+            for paper in future.result():
+                if paper['id'] not in seen_ids:
+                    seen_ids.add(paper['id'])
+                    all_papers.append(paper)
+            
+            # 如果已经获取足够的论文，取消尚未开始的批次
+            if len(all_papers) >= max_results:
+                logger.info(f"Reached maximum results limit ({max_results}), stopping batch fetching")
+                for pending in futures:
+                    pending.cancel()
+                break
     
     logger.info(f"Successfully fetched {len(all_papers)} papers from arXiv using batch fetching")
     return all_papers 
\ No newline at end of file
@@ -10,7 +10,9 @@ Conference Paper Scheduler
 
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from config_loader import load_config
@@ -23,11 +25,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 会议流程单飞锁：同一时间只允许一个流程运行（定时任务与手动测试共用，调度器重建后仍有效）
+_pipeline_lock = threading.Lock()
+
+# 推送频率 -> 调度任务定义（新增频率只需在此添加一项）
+FREQUENCY_JOBS = {
+    # 每月第一天上午9点
+    'monthly': {
+        'label': '月度',
+        'id': 'monthly_conference_job',
+        'name': 'Monthly Conference Papers',
+        'cron': {'day': 1, 'hour': 9, 'minute': 0},
+    },
+    # 每季度第一个月第一天上午10点
+    'quarterly': {
+        'label': '季度',
+        'id': 'quarterly_conference_job',
+        'name': 'Quarterly Conference Papers',
+        'cron': {'month': '1,4,7,10', 'day': 1, 'hour': 10, 'minute': 0},
+    },
+}
+
 class ConferenceScheduler:
     """会议论文定时调度器"""
     
-    def __init__(self):
-        self.scheduler = BackgroundScheduler()
+    def __init__(self, event_loop=None):
+        # 在API的事件循环中运行时使用AsyncIOScheduler，不再单独占用一个调度线程；
+        # 命令行独立运行时没有事件循环，仍使用BackgroundScheduler
+        if event_loop is not None:
+            self.scheduler = AsyncIOScheduler(event_loop=event_loop)
+        else:
+            self.scheduler = BackgroundScheduler()
         self.config = None
         self.load_config()
         self.setup_scheduler()
@@ -54,40 +82,25 @@ class ConferenceScheduler:
         
         conference_list = conferences_config.get('conference_list', [])
         
-        # 按推送频率分组
-        monthly_conferences = []
-        quarterly_conferences = []
-        
+        # 按推送频率分组（单次遍历）
+        by_frequency = {}
         for conf in conference_list:
-            frequency = conf.get('push_frequency', 'manual')
-            if frequency == 'monthly':
-                monthly_conferences.append(conf['name'])
-            elif frequency == 'quarterly':
-                quarterly_conferences.append(conf['name'])
-        
-        # 设置月度任务 - 每月第一天上午9点
-        if monthly_conferences:
-            self.scheduler.add_job(
-                func=self.run_monthly_conferences,
-                trigger=CronTrigger(day=1, hour=9, minute=0),
-                id='monthly_conference_job',
-                name='Monthly Conference Papers',
-                args=[monthly_conferences],
-                replace_existing=True
-            )
-            logger.info(f"已设置月度会议推送任务，涵盖会议: {', '.join(monthly_conferences)}")
+            by_frequency.setdefault(conf.get('push_frequency', 'manual'), []).append(conf['name'])
         
-        # 设置季度任务 - 每季度第一个月第一天上午10点
-        if quarterly_conferences:
+        # 每种推送频率注册一个任务
+        for frequency, job in FREQUENCY_JOBS.items():
+            conference_names = by_frequency.get(frequency)
+            if not conference_names:
+                continue
             self.scheduler.add_job(
-                func=self.run_quarterly_conferences,
-                trigger=CronTrigger(month='1,4,7,10', day=1, hour=10, minute=0),
-                id='quarterly_conference_job',
-                name='Quarterly Conference Papers',
-                args=[quarterly_conferences],
+                func=self._run_filtered_conferences,
+                trigger=CronTrigger(**job['cron']),
+                id=job['id'],
+                name=job['name'],
+                args=[job['label'], conference_names],
                 replace_existing=True
             )
-            logger.info(f"已设置季度会议推送任务，涵盖会议: {', '.join(quarterly_conferences)}")
+            logger.info(f"已设置{job['label']}会议推送任务，涵盖会议: {', '.join(conference_names)}")
         
         # 设置每日检查任务 - 检查是否有需要更新的会议
         self.scheduler.add_job(
@@ -99,65 +112,38 @@ class ConferenceScheduler:
         )
         logger.info("已设置每日会议检查任务")
     
-    def run_monthly_conferences(self, conference_names):
-        """运行月度会议推送"""
-        logger.info(f"开始执行月度会议论文推送: {', '.join(conference_names)}")
+    def _run_pipeline_exclusive(self, conference_names=None):
+        """运行会议流程（可只限定部分会议）；已有流程在运行时直接跳过并返回None"""
+        if not _pipeline_lock.acquire(blocking=False):
+            logger.warning("会议流程正在运行中，跳过本次执行")
+            return None
         try:
-            # 临时修改配置，只处理月度会议
-            original_config = self.config.copy()
-            
-            # 过滤出月度会议
-            filtered_conferences = []
-            for conf in self.config['conferences']['conference_list']:
-                if conf['name'] in conference_names:
-                    filtered_conferences.append(conf)
-            
-            # 临时修改配置
-            self.config['conferences']['conference_list'] = filtered_conferences
-            
-            # 运行会议流程
-            result = run_conference_pipeline()
-            
-            # 恢复原配置
-            self.config = original_config
+            return run_conference_pipeline(conference_names=conference_names)
+        finally:
+            _pipeline_lock.release()
+    
+    def _run_filtered_conferences(self, label, conference_names):
+        """只针对指定会议运行会议流程"""
+        logger.info(f"开始执行{label}会议论文推送: {', '.join(conference_names)}")
+        try:
+            # 会议名单传给获取流程，由它从配置的会议列表中过滤
+            result = self._run_pipeline_exclusive(conference_names)
             
             if result:
-                logger.info(f"月度会议推送完成: {result}")
+                logger.info(f"{label}会议推送完成: {result}")
             else:
-                logger.warning("月度会议推送没有结果")
+                logger.warning(f"{label}会议推送没有结果")
                 
         except Exception as e:
-            logger.error(f"月度会议推送失败: {str(e)}")
+            logger.error(f"{label}会议推送失败: {str(e)}")
+    
+    def run_monthly_conferences(self, conference_names):
+        """运行月度会议推送"""
+        self._run_filtered_conferences("月度", conference_names)
     
     def run_quarterly_conferences(self, conference_names):
         """运行季度会议推送"""
-        logger.info(f"开始执行季度会议论文推送: {', '.join(conference_names)}")
-        try:
-            # 临时修改配置，只处理季度会议
-            original_config = self.config.copy()
-            
-            # 过滤出季度会议
-            filtered_conferences = []
-            for conf in self.config['conferences']['conference_list']:
-                if conf['name'] in conference_names:
-                    filtered_conferences.append(conf)
-            
-            # 临时修改配置
-            self.config['conferences']['conference_list'] = filtered_conferences
-            
-            # 运行会议流程
-            result = run_conference_pipeline()
-            
-            # 恢复原配置
-            self.config = original_config
-            
-            if result:
-                logger.info(f"季度会议推送完成: {result}")
-            else:
-                logger.warning("季度会议推送没有结果")
-                
-        except Exception as e:
-            logger.error(f"季度会议推送失败: {str(e)}")
+        self._run_filtered_conferences("季度", conference_names)
     
     def daily_check(self):
         """每日检查任务"""
@@ -236,7 +222,7 @@ class ConferenceScheduler:
         """立即运行一次测试"""
         logger.info("执行立即测试运行")
         try:
-            result = run_conference_pipeline()
+            result = self._run_pipeline_exclusive()
             logger.info(f"立即测试运行完成: {result}")
             return result
         except Exception as e:
@@ -246,16 +232,16 @@ class ConferenceScheduler:
 # 全局调度器实例
 _conference_scheduler = None
 
-def get_conference_scheduler():
-    """获取全局调度器实例"""
+def get_conference_scheduler(event_loop=None):
+    """获取全局调度器实例；首次创建时传入event_loop则在该事件循环上调度"""
     global _conference_scheduler
     if _conference_scheduler is None:
-        _conference_scheduler = ConferenceScheduler()
+        _conference_scheduler = ConferenceScheduler(event_loop)
     return _conference_scheduler
 
-def start_conference_scheduler():
+def start_conference_scheduler(event_loop=None):
     """启动会议论文调度器"""
-    scheduler = get_conference_scheduler()
+    scheduler = get_conference_scheduler(event_loop)
     scheduler.start()
     return scheduler
 
@@ -269,7 +255,6 @@ def stop_conference_scheduler():
 if __name__ == "__main__":
     # 命令行运行时启动调度器
     import signal
-    import time
     
     def signal_handler(signum, frame):
         logger.info("收到停止信号，正在关闭调度器...")
@@ -283,9 +268,11 @@ if __name__ == "__main__":
     scheduler = start_conference_scheduler()
     
     try:
-        # 保持程序运行
-        while True:
-            time.sleep(60)  # 每分钟检查一次
+        # 保持程序运行：阻塞直到收到信号，不再每分钟唤醒一次
+        try:
+            signal.pause()
+        except AttributeError:  # Windows没有signal.pause
+            threading.Event().wait()
     except KeyboardInterrupt:
         logger.info("收到中断信号，正在关闭...")
         stop_conference_scheduler()
\ No newline at end of file
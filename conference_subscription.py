@@ -10,13 +10,23 @@ Conference Paper Subscription Module
 
 import os
 import json
+import mmap
+import html
 import logging
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from config_loader import load_config
+from email_notifier import send_email_message
+
+try:
+    import orjson  # C实现的JSON编解码，比标准库json快数倍
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 from openreview_fetcher import run_conference_fetch
 
 # 设置日志
@@ -30,57 +40,189 @@ logger = logging.getLogger(__name__)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFERENCE_OUTPUT_DIR = os.path.join(SCRIPT_DIR, "conference_output")
 CONFERENCE_SUBSCRIPTION_HISTORY_FILE = os.path.join(SCRIPT_DIR, "conference_subscription_history.json")
+# 增量日志：每次发送只追加新ID，快照只在日志过大时重写
+CONFERENCE_SUBSCRIPTION_LOG_FILE = os.path.join(SCRIPT_DIR, "conference_subscription_history.log")
+HISTORY_LOG_BUFFER_SIZE = 1 << 16
+HISTORY_LOG_COMPACT_BYTES = 1 << 20  # 日志超过1MB时合并进快照
+
+CONFERENCE_PREPARE_WORKERS = 4  # 并行解析/过滤/分类会议文件的线程数
+
+# 会议订阅邮件中不变的部分（样式表、页脚），只有标题、摘要和论文列表需要每次生成
+_CONFERENCE_EMAIL_HEAD = """<html>
+<head>
+  <style>
+    body { font-family: Arial, sans-serif; line-height: 1.6; }
+    .header { background-color: #3498db; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
+    .conference-info { background-color: #ecf0f1; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
+    .category { margin-bottom: 30px; }
+    .category-title { 
+      font-size: 18px; 
+      font-weight: bold; 
+      color: #2c3e50; 
+      margin-bottom: 15px;
+      padding-bottom: 5px;
+      border-bottom: 2px solid #e74c3c;
+    }
+    .paper { 
+      margin-bottom: 20px; 
+      padding: 15px; 
+      border: 1px solid #e0e0e0; 
+      border-radius: 8px;
+      background-color: #f9f9f9;
+    }
+    .title { font-size: 16px; font-weight: bold; color: #1a0dab; margin-bottom: 5px; }
+    .link { color: #1a0dab; text-decoration: none; }
+    .link:hover { text-decoration: underline; }
+    .authors { font-size: 12px; color: #666; margin-bottom: 8px; }
+    .abstract { font-size: 14px; color: #333; margin-bottom: 8px; }
+    .keywords { font-size: 12px; color: #e74c3c; background-color: #fdf2f2; padding: 4px 8px; border-radius: 4px; }
+    .category-summary { font-size: 14px; color: #7f8c8d; margin-bottom: 10px; }
+  </style>
+</head>
+<body>
+"""
+
+_CONFERENCE_EMAIL_FOOTER = """
+  <hr style="margin-top: 40px; border: none; border-top: 1px solid #bdc3c7;">
+  <p style="text-align: center; color: #7f8c8d; font-size: 12px;">
+    🤖 由 arXiv RSS Filter Bot (Conference Extension) 自动生成<br>
+    📧 会议论文自动推送服务 - 专注顶级AI与安全会议
+  </p>
+</body></html>"""
+
+# 分类关键词匹配表缓存：id(分类配置) -> (分类配置, 匹配表)
+_MATCHER_CACHE = {}
+
+def _json_dumps(obj):
+    """把对象序列化为紧凑的UTF-8 JSON bytes；有orjson时直接生成bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _empty_conference_history():
+    """空的会议订阅历史记录"""
+    return {"sent_papers": [], "last_sent": None, "sent_by_conference": {}}
+
+def _replay_conference_history_log(history):
+    """
+    把增量日志中的发送记录合并到快照中
+
+    Args:
+        history (dict): 从快照加载的历史记录（原地更新）
+    """
+    if not os.path.exists(CONFERENCE_SUBSCRIPTION_LOG_FILE):
+        return history
+
+    sent_papers = set(history.get("sent_papers", []))
+    sent_by_conference = {name: set(ids) for name, ids in history.get("sent_by_conference", {}).items()}
+    last_sent = history.get("last_sent")
+    replayed = 0
+
+    with open(CONFERENCE_SUBSCRIPTION_LOG_FILE, 'rb') as f:
+        for line in f:
+            try:
+                record = _json_loads(line)
+            except ValueError:
+                # 进程中断时最后一行可能不完整，跳过即可
+                continue
+            if "checked" in record:
+                # 检查点记录：该时间之前修改的会议文件都已完整处理过
+                history["files_checked_ns"] = max(history.get("files_checked_ns") or 0, record["checked"])
+                continue
+            paper_id = record.get("id")
+            if not paper_id:
+                continue
+            sent_papers.add(paper_id)
+            sent_by_conference.setdefault(record.get("c", "Unknown"), set()).add(paper_id)
+            if record.get("t") and (last_sent is None or record["t"] > last_sent):
+                last_sent = record["t"]
+            replayed += 1
+
+    if replayed:
+        history["sent_papers"] = list(sent_papers)
+        history["sent_by_conference"] = {name: sorted(ids) for name, ids in sent_by_conference.items()}
+        history["last_sent"] = last_sent
+    return history
 
 def load_conference_subscription_history():
     """
-    加载会议订阅历史记录，用于避免发送重复的论文
+    加载会议订阅历史记录（快照 + 增量日志），用于避免发送重复的论文
     
     Returns:
         dict: 包含已发送论文ID的字典
     """
-    if not os.path.exists(CONFERENCE_SUBSCRIPTION_HISTORY_FILE):
-        return {"sent_papers": [], "last_sent": None, "sent_by_conference": {}}
-    
+    history = _empty_conference_history()
     try:
-        with open(CONFERENCE_SUBSCRIPTION_HISTORY_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if os.path.exists(CONFERENCE_SUBSCRIPTION_HISTORY_FILE):
+            with open(CONFERENCE_SUBSCRIPTION_HISTORY_FILE, 'rb') as f:
+                history = _json_loads(f.read())
+        return _replay_conference_history_log(history)
     except Exception as e:
         logger.error(f"加载会议订阅历史记录失败: {str(e)}")
-        return {"sent_papers": [], "last_sent": None, "sent_by_conference": {}}
+        return _empty_conference_history()
 
 def save_conference_subscription_history(history):
     """
-    保存会议订阅历史记录
+    保存会议订阅历史记录快照，并清空已合并进快照的增量日志
     
     Args:
         history (dict): 包含已发送论文ID的字典
     """
+    tmp_file = CONFERENCE_SUBSCRIPTION_HISTORY_FILE + ".tmp"
     try:
-        with open(CONFERENCE_SUBSCRIPTION_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        # 历史记录只由程序读取，不缩进，输出体积约减半
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(history))
+        os.replace(tmp_file, CONFERENCE_SUBSCRIPTION_HISTORY_FILE)
+        # 快照已包含日志中的全部记录，截断日志
+        if os.path.exists(CONFERENCE_SUBSCRIPTION_LOG_FILE):
+            open(CONFERENCE_SUBSCRIPTION_LOG_FILE, 'w').close()
         logger.info(f"会议订阅历史记录已保存到 {CONFERENCE_SUBSCRIPTION_HISTORY_FILE}")
     except Exception as e:
         logger.error(f"保存会议订阅历史记录失败: {str(e)}")
 
-def get_latest_conference_files():
+def open_conference_history_log():
+    """
+    以追加方式打开增量日志，每条发送记录写一行 {"c": 会议, "id": 论文ID, "t": 时间}
+    
+    Returns:
+        file: 带缓冲的二进制文件对象，调用方负责关闭
+    """
+    return open(CONFERENCE_SUBSCRIPTION_LOG_FILE, 'ab', buffering=HISTORY_LOG_BUFFER_SIZE)
+
+def conference_history_log_needs_compaction():
+    """增量日志超过阈值时需要重写快照"""
+    try:
+        return os.path.getsize(CONFERENCE_SUBSCRIPTION_LOG_FILE) > HISTORY_LOG_COMPACT_BYTES
+    except OSError:
+        return False
+
+def get_latest_conference_files(with_mtime=False):
     """
     获取最新的会议论文文件
     
+    Args:
+        with_mtime (bool): 为True时同时返回每个文件的修改时间（纳秒）
+    
     Returns:
-        list: 最新会议论文文件的路径列表
+        list: 最新会议论文文件的路径列表；with_mtime为True时为 (路径, st_mtime_ns) 列表
     """
     if not os.path.exists(CONFERENCE_OUTPUT_DIR):
         logger.error(f"会议输出目录不存在: {CONFERENCE_OUTPUT_DIR}")
         return []
         
-    conference_files = [f for f in os.listdir(CONFERENCE_OUTPUT_DIR) if f.endswith('.json')]
-    if not conference_files:
+    # scandir返回的DirEntry自带完整路径并缓存stat结果，不需要逐个拼接路径和getmtime
+    with os.scandir(CONFERENCE_OUTPUT_DIR) as it:
+        entries = [e for e in it if e.name.endswith('.json') and e.is_file()]
+    if not entries:
         logger.info("没有找到会议论文文件")
         return []
         
     # 按文件修改时间排序（最新在前）
-    conference_files.sort(key=lambda f: os.path.getmtime(os.path.join(CONFERENCE_OUTPUT_DIR, f)), reverse=True)
-    return [os.path.join(CONFERENCE_OUTPUT_DIR, f) for f in conference_files]
+    entries.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+    if with_mtime:
+        return [(e.path, e.stat().st_mtime_ns) for e in entries]
+    return [e.path for e in entries]
 
 def parse_conference_file(file_path):
     """
@@ -93,13 +235,38 @@ def parse_conference_file(file_path):
         dict: 会议论文信息
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            # orjson可直接解析内存映射的memoryview，省去把整个文件复制成bytes的一步
+            if orjson is None or os.fstat(f.fileno()).st_size == 0:
+                return _json_loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = orjson.loads(view)
         return data
     except Exception as e:
         logger.error(f"解析会议论文文件失败: {str(e)}")
         return {}
 
+def _build_keyword_matcher(categories_config):
+    """
+    预编译分类关键词匹配表
+    
+    Returns:
+        list: [(分类名, 小写关键词元组, 小写关键词集合)]，按配置顺序排列
+    """
+    table = []
+    for category_name, keywords in categories_config.items():
+        lowered = tuple(keyword.lower() for keyword in keywords)
+        table.append((category_name, lowered, frozenset(lowered)))
+    return table
+
+def _get_keyword_matcher(categories_config):
+    """获取（并缓存）分类配置对应的匹配表；缓存中同时持有配置对象，保证id不会被复用"""
+    cached = _MATCHER_CACHE.get(id(categories_config))
+    if cached is None or cached[0] is not categories_config:
+        _MATCHER_CACHE.clear()  # 只保留当前配置
+        cached = _MATCHER_CACHE[id(categories_config)] = (categories_config, _build_keyword_matcher(categories_config))
+    return cached[1]
+
 def classify_conference_paper(paper, categories_config):
     """
     根据标题和摘要对会议论文进行分类
@@ -111,18 +278,20 @@ def classify_conference_paper(paper, categories_config):
     Returns:
         str: 分类名称，如果没有匹配则返回'🔧 Other'
     """
-    title = paper.get('title', '').lower()
-    abstract = paper.get('abstract', '').lower()
-    text_content = f"{title} {abstract}"
+    # 先拼接再整体转小写：每篇论文只做一次小写转换，只分配一个字符串
+    text_content = f"{paper.get('title', '')} {paper.get('abstract', '')}".lower()
     
     # 检查匹配的关键词
     matched_keywords = paper.get('matched_keywords', [])
     
-    # 遍历所有分类，找到第一个匹配的
-    for category_name, keywords in categories_config.items():
-        for keyword in keywords:
-            if keyword.lower() in text_content or keyword.lower() in matched_keywords:
-                return category_name
+    table = _get_keyword_matcher(categories_config)
+    
+    # 遍历所有分类，找到第一个匹配的（关键词已预先转为小写，用C实现的子串查找逐个检查）
+    for category_name, keywords, keyword_set in table:
+        if any(keyword in text_content for keyword in keywords):
+            return category_name
+        if matched_keywords and not keyword_set.isdisjoint(matched_keywords):
+            return category_name
     
     # 如果没有匹配到任何分类，返回默认分类
     return "🔧 Other"
@@ -143,6 +312,10 @@ def categorize_and_sort_conference_papers(papers, config):
         # 如果没有配置分类，使用默认分类
         categories_config = {"🔧 All Papers": []}
     
+    # 先整体按获取时间排序（最新的在前），分组后每个分类内自然有序；
+    # 获取器输出本身接近有序，Timsort在这种输入上接近线性
+    papers = sorted(papers, key=lambda x: x.get('fetched_at', ''), reverse=True)
+    
     # 按分类组织论文
     categorized_papers = defaultdict(list)
     
@@ -151,19 +324,18 @@ def categorize_and_sort_conference_papers(papers, config):
         category = classify_conference_paper(paper, categories_config)
         categorized_papers[category].append(paper)
     
-    # 每个分类内按获取时间排序（最新的在前）
-    for category in categorized_papers:
-        categorized_papers[category].sort(
-            key=lambda x: x.get('fetched_at', ''), 
-            reverse=True
-        )
-    
-    # 按分类名称排序，确保一致的显示顺序
-    sorted_categories = dict(sorted(categorized_papers.items()))
+    # 按配置中的分类顺序输出，未匹配的分类放在最后，确保一致的显示顺序
+    sorted_categories = {
+        category: categorized_papers[category]
+        for category in categories_config
+        if category in categorized_papers
+    }
+    for category, category_papers in categorized_papers.items():
+        sorted_categories.setdefault(category, category_papers)
     
     return sorted_categories
 
-def send_conference_subscription_email(conference_data, new_papers, config):
+def send_conference_subscription_email(conference_data, new_papers, config, categorized_papers=None):
     """
     发送会议订阅邮件
     
@@ -171,6 +343,7 @@ def send_conference_subscription_email(conference_data, new_papers, config):
         conference_data (dict): 会议数据
         new_papers (list): 新论文列表
         config (dict): 配置信息
+        categorized_papers (dict, optional): 已分类排序的论文；提供时不再重新分类
         
     Returns:
         bool: 是否发送成功
@@ -196,7 +369,8 @@ def send_conference_subscription_email(conference_data, new_papers, config):
         
     try:
         # 对论文进行分类和排序
-        categorized_papers = categorize_and_sort_conference_papers(new_papers, config)
+        if categorized_papers is None:
+            categorized_papers = categorize_and_sort_conference_papers(new_papers, config)
         total_papers = sum(len(papers_in_cat) for papers_in_cat in categorized_papers.values())
         
         conference_name = conference_data.get('conference', 'Unknown Conference')
@@ -208,68 +382,41 @@ def send_conference_subscription_email(conference_data, new_papers, config):
         msg['To'] = recipient
         msg['Subject'] = f"{subject_prefix} {conference_name} - 最新论文更新 ({datetime.now().strftime('%Y-%m-%d')})"
         
-        # 构建邮件正文
-        body = f"""<html>
-<head>
-  <style>
-    body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-    .header {{ background-color: #3498db; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-    .conference-info {{ background-color: #ecf0f1; padding: 15px; border-radius: 8px; margin-bottom: 20px; }}
-    .category {{ margin-bottom: 30px; }}
-    .category-title {{ 
-      font-size: 18px; 
-      font-weight: bold; 
-      color: #2c3e50; 
-      margin-bottom: 15px;
-      padding-bottom: 5px;
-      border-bottom: 2px solid #e74c3c;
-    }}
-    .paper {{ 
-      margin-bottom: 20px; 
-      padding: 15px; 
-      border: 1px solid #e0e0e0; 
-      border-radius: 8px;
-      background-color: #f9f9f9;
-    }}
-    .title {{ font-size: 16px; font-weight: bold; color: #1a0dab; margin-bottom: 5px; }}
-    .link {{ color: #1a0dab; text-decoration: none; }}
-    .link:hover {{ text-decoration: underline; }}
-    .authors {{ font-size: 12px; color: #666; margin-bottom: 8px; }}
-    .abstract {{ font-size: 14px; color: #333; margin-bottom: 8px; }}
-    .keywords {{ font-size: 12px; color: #e74c3c; background-color: #fdf2f2; padding: 4px 8px; border-radius: 4px; }}
-    .category-summary {{ font-size: 14px; color: #7f8c8d; margin-bottom: 10px; }}
-  </style>
-</head>
-<body>
-  <div class="header">
-    <h2>🎓 {conference_name} - 会议论文更新</h2>
+        # 构建邮件正文：各片段追加到列表，最后一次性拼接（避免重复 += 拷贝整个字符串）
+        conference_name_html = html.escape(conference_name)
+        parts = [_CONFERENCE_EMAIL_HEAD, f"""  <div class="header">
+    <h2>🎓 {conference_name_html} - 会议论文更新</h2>
   </div>
   
   <div class="conference-info">
     <strong>📊 本次更新摘要:</strong><br>
-    • 会议: {conference_name}<br>
+    • 会议: {conference_name_html}<br>
     • 新增论文: <strong>{total_papers}</strong> 篇<br>
     • 更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
   </div>
-"""
+"""]
+        # 循环中频繁使用的方法先绑定为局部变量，省去每次的属性查找
+        append = parts.append
+        escape = html.escape
+        get = dict.get
         
         # 按分类添加论文
         for category_name, papers_in_category in categorized_papers.items():
             if not papers_in_category:
                 continue
                 
-            body += f"""
+            append(f"""
   <div class="category">
-    <div class="category-title">{category_name}</div>
+    <div class="category-title">{escape(category_name)}</div>
     <div class="category-summary">本类别共 {len(papers_in_category)} 篇论文：</div>
-"""
+""")
             
             for paper in papers_in_category:
-                title = paper.get('title', 'No Title')
-                abstract = paper.get('abstract', 'No Abstract')
-                authors = paper.get('authors', [])
-                url = paper.get('url', '')
-                matched_keywords = paper.get('matched_keywords', [])
+                title = get(paper, 'title', 'No Title')
+                abstract = get(paper, 'abstract', 'No Abstract')
+                authors = get(paper, 'authors', [])
+                url = get(paper, 'url', '')
+                matched_keywords = get(paper, 'matched_keywords', [])
                 
                 # 处理作者信息
                 authors_str = ', '.join(authors[:5]) if authors else 'No Authors'
@@ -282,37 +429,30 @@ def send_conference_subscription_email(conference_data, new_papers, config):
                 # 匹配关键词显示
                 keywords_display = ', '.join(matched_keywords[:5]) if matched_keywords else ''
                 
-                body += f"""
+                # 标题、摘要等来自外部数据，转义后再写入HTML
+                append(f"""
     <div class="paper">
-      <div class="title"><a href="{url}" class="link">{title}</a></div>
-      <div class="authors">👥 作者: {authors_str}</div>
-      <div class="abstract">📝 摘要: {abstract_display}</div>"""
+      <div class="title"><a href="{escape(url)}" class="link">{escape(title)}</a></div>
+      <div class="authors">👥 作者: {escape(authors_str)}</div>
+      <div class="abstract">📝 摘要: {escape(abstract_display)}</div>""")
                 
                 if keywords_display:
-                    body += f"""
-      <div class="keywords">🔍 匹配关键词: {keywords_display}</div>"""
+                    append(f"""
+      <div class="keywords">🔍 匹配关键词: {escape(keywords_display)}</div>""")
                 
-                body += """
-    </div>"""
+                append("""
+    </div>""")
             
-            body += "  </div>"  # 关闭category div
+            append("  </div>")  # 关闭category div
         
-        body += """
-  <hr style="margin-top: 40px; border: none; border-top: 1px solid #bdc3c7;">
-  <p style="text-align: center; color: #7f8c8d; font-size: 12px;">
-    🤖 由 arXiv RSS Filter Bot (Conference Extension) 自动生成<br>
-    📧 会议论文自动推送服务 - 专注顶级AI与安全会议
-  </p>
-</body></html>"""
+        append(_CONFERENCE_EMAIL_FOOTER)
+        body = "".join(parts)
         
         # 添加HTML正文
-        msg.attach(MIMEText(body, 'html'))
+        msg.attach(MIMEText(body, 'html', 'utf-8'))
         
-        # 发送邮件
-        with smtplib.SMTP(smtp_server, port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
+        # 发送邮件（复用进程内已认证的SMTP连接，省去每封邮件的TLS握手和登录）
+        send_email_message(msg, smtp_server, port, username, password)
             
         logger.info(f"成功发送会议订阅邮件到 {recipient} - {conference_name}: {total_papers}篇论文")
         return True
@@ -321,6 +461,42 @@ def send_conference_subscription_email(conference_data, new_papers, config):
         logger.error(f"发送会议订阅邮件失败: {str(e)}")
         return False
 
+def prepare_conference_file(file_path, sent_papers, config):
+    """
+    解析会议文件，过滤出未发送的论文并完成分类（不访问共享的可变状态，可在线程池中运行）
+    
+    Args:
+        file_path (str): 会议论文文件路径
+        sent_papers (frozenset): 提交任务前的已发送论文ID快照（主线程之后新增的ID由调用方再去重）
+        config (dict): 配置信息
+        
+    Returns:
+        tuple: (会议信息, 新论文列表, 按分类组织的新论文, 总论文数)；文件无效时返回None
+    """
+    # 解析会议文件
+    conference_data = parse_conference_file(file_path)
+    if not conference_data:
+        return None
+    papers = conference_data.get('papers', [])
+    
+    # 过滤出新论文，已发送的论文不保留
+    total_count = 0
+    new_papers = []
+    append = new_papers.append
+    file_ids = set()  # 同一文件中重复出现的论文只发送一次
+    get = dict.get
+    for p in papers:
+        total_count += 1
+        paper_id = get(p, 'id')
+        if paper_id in sent_papers or paper_id in file_ids:
+            continue
+        if paper_id:
+            file_ids.add(paper_id)
+        append(p)
+    
+    categorized_papers = categorize_and_sort_conference_papers(new_papers, config) if new_papers else {}
+    return conference_data, new_papers, categorized_papers, total_count
+
 def process_conference_subscription():
     """
     处理会议订阅功能
@@ -353,72 +529,102 @@ def process_conference_subscription():
     # 加载订阅历史记录
     subscription_history = load_conference_subscription_history()
     sent_papers = set(subscription_history.get("sent_papers", []))
-    sent_by_conference = subscription_history.get("sent_by_conference", {})
+    # 每个会议的已发送ID在内存中保持为集合，只在保存时转换为列表
+    sent_by_conference = {name: set(ids) for name, ids in subscription_history.get("sent_by_conference", {}).items()}
+    # 各会议的已发送ID合并进全局集合，过滤时每篇论文只需查一个集合
+    for conference_ids in sent_by_conference.values():
+        sent_papers.update(conference_ids)
     
     logger.info(f"已加载会议订阅历史记录，共有 {len(sent_papers)} 篇已发送论文")
     
     # 获取最新的会议论文文件
-    conference_files = get_latest_conference_files()
-    if not conference_files:
+    files_with_mtime = get_latest_conference_files(with_mtime=True)
+    if not files_with_mtime:
         logger.info("没有找到会议论文文件")
         return False
     
+    # 上次完整处理之后没有修改过的文件不需要再解析；全部未修改时直接结束
+    files_checked_ns = subscription_history.get("files_checked_ns") or 0
+    newest_mtime_ns = files_with_mtime[0][1]
+    conference_files = [path for path, mtime_ns in files_with_mtime if mtime_ns > files_checked_ns]
+    if not conference_files:
+        logger.info("会议论文文件自上次检查后没有更新，跳过")
+        return False
+    
     total_new_papers = 0
     successful_sends = 0
-    
-    # 处理每个会议文件
-    for file_path in conference_files:
-        try:
-            logger.info(f"处理会议文件: {os.path.basename(file_path)}")
-            
-            # 解析会议文件
-            conference_data = parse_conference_file(file_path)
-            if not conference_data:
-                logger.warning(f"跳过无效的会议文件: {file_path}")
-                continue
-            
-            conference_name = conference_data.get('conference', 'Unknown')
-            all_papers = conference_data.get('papers', [])
-            
-            # 过滤出新论文
-            conference_sent_papers = set(sent_by_conference.get(conference_name, []))
-            new_papers = [p for p in all_papers if p.get('id') not in sent_papers and p.get('id') not in conference_sent_papers]
-            
-            logger.info(f"{conference_name}: 总论文{len(all_papers)}篇，新论文{len(new_papers)}篇")
-            
-            if new_papers:
-                # 发送订阅邮件
-                success = send_conference_subscription_email(conference_data, new_papers, config)
+    all_processed = True  # 所有文件都处理成功时才记录检查点，失败的文件下次仍会重新处理
+    
+    # 处理每个会议文件（新发送的ID逐条追加到增量日志，单个文件的错误在循环内捕获）
+    # 解析、过滤和分类在线程池中提前进行，与SMTP发送的网络等待重叠；发送和历史记录更新仍按文件顺序在当前线程进行
+    # 日志文件和线程池用with管理，循环中途抛出异常时也会关闭
+    with open_conference_history_log() as history_log, \
+            ThreadPoolExecutor(max_workers=CONFERENCE_PREPARE_WORKERS) as executor:
+        # 工作线程只读取提交前的快照；主线程发送后向 sent_papers 添加的ID在下面逐个文件去重
+        sent_snapshot = frozenset(sent_papers)
+        futures = [executor.submit(prepare_conference_file, file_path, sent_snapshot, config) for file_path in conference_files]
+        for file_path, future in zip(conference_files, futures):
+            try:
+                logger.info(f"处理会议文件: {os.path.basename(file_path)}")
                 
-                if success:
-                    successful_sends += 1
-                    total_new_papers += len(new_papers)
-                    
-                    # 更新历史记录
-                    if conference_name not in sent_by_conference:
-                        sent_by_conference[conference_name] = []
-                    
-                    for paper in new_papers:
-                        paper_id = paper.get('id')
-                        if paper_id:
-                            sent_papers.add(paper_id)
-                            sent_by_conference[conference_name].append(paper_id)
+                prepared = future.result()
+                if prepared is None:
+                    logger.warning(f"跳过无效的会议文件: {file_path}")
+                    continue
+                
+                conference_data, new_papers, categorized_papers, total_count = prepared
+                conference_name = conference_data.get('conference', 'Unknown')
+                
+                # 准备阶段之后前面的文件可能已发送了相同的论文，去掉这些论文
+                if any(p.get('id') in sent_papers for p in new_papers):
+                    new_papers = [p for p in new_papers if p.get('id') not in sent_papers]
+                    categorized_papers = categorize_and_sort_conference_papers(new_papers, config) if new_papers else {}
+                
+                logger.info(f"{conference_name}: 总论文{total_count}篇，新论文{len(new_papers)}篇")
+                
+                if new_papers:
+                    # 发送订阅邮件
+                    success = send_conference_subscription_email(
+                        conference_data, new_papers, config, categorized_papers=categorized_papers
+                    )
                     
-                    logger.info(f"成功处理 {conference_name}: 发送{len(new_papers)}篇新论文")
+                    if success:
+                        successful_sends += 1
+                        total_new_papers += len(new_papers)
+                        
+                        # 更新历史记录
+                        conference_ids = sent_by_conference.setdefault(conference_name, set())
+                        sent_at = datetime.now().isoformat()
+                        for paper in new_papers:
+                            paper_id = paper.get('id')
+                            if paper_id:
+                                sent_papers.add(paper_id)
+                                conference_ids.add(paper_id)
+                                history_log.write(_json_dumps({"c": conference_name, "id": paper_id, "t": sent_at}) + b"\n")
+                        
+                        logger.info(f"成功处理 {conference_name}: 发送{len(new_papers)}篇新论文")
+                    else:
+                        all_processed = False
+                        logger.error(f"发送 {conference_name} 的邮件失败")
                 else:
-                    logger.error(f"发送 {conference_name} 的邮件失败")
-            else:
-                logger.info(f"{conference_name}: 没有新论文需要发送")
-                
-        except Exception as e:
-            logger.error(f"处理会议文件时发生错误 {file_path}: {str(e)}")
+                    logger.info(f"{conference_name}: 没有新论文需要发送")
+                    
+            except Exception as e:
+                all_processed = False
+                logger.error(f"处理会议文件时发生错误 {file_path}: {str(e)}")
+    
+        if all_processed:
+            history_log.write(_json_dumps({"checked": newest_mtime_ns}) + b"\n")
+            subscription_history["files_checked_ns"] = newest_mtime_ns
     
     # 保存更新的历史记录
     if total_new_papers > 0:
-        subscription_history["sent_papers"] = list(sent_papers)
-        subscription_history["sent_by_conference"] = sent_by_conference
-        subscription_history["last_sent"] = datetime.now().isoformat()
-        save_conference_subscription_history(subscription_history)
+        # 新记录已写入增量日志；日志过大时才重写完整快照
+        if conference_history_log_needs_compaction():
+            subscription_history["sent_papers"] = list(sent_papers)
+            subscription_history["sent_by_conference"] = {name: sorted(ids) for name, ids in sent_by_conference.items()}
+            subscription_history["last_sent"] = datetime.now().isoformat()
+            save_conference_subscription_history(subscription_history)
         
         logger.info(f"会议论文订阅完成: 成功发送{successful_sends}个会议的{total_new_papers}篇论文")
     else:
@@ -426,14 +632,17 @@ def process_conference_subscription():
     
     return total_new_papers > 0
 
-def run_conference_pipeline():
+def run_conference_pipeline(conference_names=None):
     """
     运行完整的会议论文流程：获取 + 订阅推送
+    
+    Args:
+        conference_names (list, optional): 只获取这些会议；为None时获取配置中的全部会议
     """
     logger.info("开始运行完整会议论文流程")
     
     # 第一步：获取会议论文
-    fetch_results = run_conference_fetch()
+    fetch_results = run_conference_fetch(conference_names=conference_names)
     
     if not fetch_results:
         logger.info("会议论文获取失败，跳过订阅推送")
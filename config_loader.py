@@ -9,11 +9,34 @@ arXiv RSS 过滤机器人 - 配置加载器
 import yaml  # 导入YAML解析库，用于读取配置文件
 import logging  # 导入日志模块
 import os  # 导入操作系统模块，用于文件路径操作
+import copy  # 用于返回缓存配置的副本，避免调用方修改缓存
+
+# 优先使用libyaml的C实现加载/输出YAML，未编译libyaml时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器
 
 DEFAULT_CONFIG_FILE = "config.yaml"  # 默认配置文件名
 
+REQUIRED_CONFIG_KEYS = ('keywords', 'max_results')  # 必需的配置键
+
+# 可选配置项的默认值，配置中不包含这些键时使用
+CONFIG_DEFAULTS = {
+    'recency_weight': 0.3,  # 时效性权重
+    'author_weight': 0.2,  # 作者影响力权重
+    'run_hour': None,  # 默认不设置定时运行
+    'email_on_error': False,  # 默认不发送错误邮件
+    'max_days_old': 30,  # 默认只获取30天内的论文
+    'history_enabled': True,  # 默认启用历史记录功能
+}
+
+# 已解析配置的缓存：绝对路径 -> {"mtime": (st_mtime_ns, st_size), "data": 配置字典}
+# 文件未变化时直接返回缓存，避免每次请求都重新解析YAML
+_CONFIG_CACHE = {}
+
 def load_config(config_file=DEFAULT_CONFIG_FILE):
     """
     从YAML文件加载配置
@@ -34,24 +57,27 @@ def load_config(config_file=DEFAULT_CONFIG_FILE):
             logger.error(f"Configuration file {config_file} not found")  # 记录错误：配置文件未找到
             raise FileNotFoundError(f"Configuration file {config_file} not found")  # 抛出文件未找到异常
         
+        # 文件修改时间和大小未变化时直接返回缓存的配置
+        cache_key = os.path.abspath(config_file)
+        st = os.stat(config_file)
+        mtime = (st.st_mtime_ns, st.st_size)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached["mtime"] == mtime:
+            return copy.deepcopy(cached["data"])
+        
         # 打开并解析YAML配置文件
         with open(config_file, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file) or {}  # 安全加载YAML内容，如果文件不存在则返回空字典
+            config = yaml.load(file, Loader=_Loader) or {}  # 安全加载YAML内容，如果文件为空则返回空字典
             
         # 验证必要的配置项是否存在
-        required_keys = ['keywords', 'max_results']  # 必需的配置键
-        for key in required_keys:
+        for key in REQUIRED_CONFIG_KEYS:
             if key not in config:
                 logger.error(f"Missing required configuration: {key}")  # 记录错误：缺少必要配置
                 raise ValueError(f"Missing required configuration: {key}")  # 抛出值错误异常
         
-        # 设置默认值，如果配置中不包含这些键
-        config.setdefault('recency_weight', 0.3)  # 设置默认时效性权重为0.3
-        config.setdefault('author_weight', 0.2)  # 设置默认作者影响力权重为0.2
-        config.setdefault('run_hour', None)  # 默认不设置定时运行
-        config.setdefault('email_on_error', False)  # 默认不发送错误邮件
-        config.setdefault('max_days_old', 30)  # 默认只获取30天内的论文
-        config.setdefault('history_enabled', True)  # 默认启用历史记录功能
+        # 设置默认值，如果配置中不包含这些键（默认值都是不可变对象，可直接共享）
+        for key, default in CONFIG_DEFAULTS.items():
+            config.setdefault(key, default)
         
         # 处理日期范围配置（如果存在）
         if 'date_range' in config:
@@ -77,13 +103,27 @@ def load_config(config_file=DEFAULT_CONFIG_FILE):
                 else:
                     logger.info(f"Using date range filter: {date_range}")
                 
+        _CONFIG_CACHE[cache_key] = {"mtime": mtime, "data": config}  # 缓存验证后的配置
         logger.info(f"配置加载完成，关键词数量: {len(config.get('keywords', []))}")
-        return config  # 返回完整的配置字典
+        return copy.deepcopy(config)  # 返回完整的配置字典（副本）
         
     except Exception as e:  # 捕获所有可能的异常
         logger.error(f"Error loading configuration: {str(e)}", exc_info=True)  # 记录错误详情
         raise  # 重新抛出异常，让调用者处理
 
+def reload_config(config_file=DEFAULT_CONFIG_FILE):
+    """
+    丢弃缓存并重新从YAML文件加载配置
+    
+    Args:
+        config_file (str): 配置文件路径
+        
+    Returns:
+        dict: 配置参数字典
+    """
+    _CONFIG_CACHE.pop(os.path.abspath(config_file), None)
+    return load_config(config_file)
+
 def save_config(config, config_file=DEFAULT_CONFIG_FILE):
     """
     将配置保存到YAML文件
@@ -100,9 +140,12 @@ def save_config(config, config_file=DEFAULT_CONFIG_FILE):
         config_dir = os.path.dirname(os.path.abspath(config_file))
         os.makedirs(config_dir, exist_ok=True)
         
+        # 使缓存失效，下次加载时重新解析
+        _CONFIG_CACHE.pop(os.path.abspath(config_file), None)
+        
         # 写入配置文件
         with open(config_file, 'w', encoding='utf-8') as file:
-            yaml.dump(config, file, default_flow_style=False)  # 将配置写入YAML文件
+            yaml.dump(config, file, Dumper=_Dumper, default_flow_style=False)  # 将配置写入YAML文件
             
         logger.info(f"Configuration saved to {config_file}")  # 记录保存成功信息
         return True  # 返回成功标志
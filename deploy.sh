@@ -66,7 +66,7 @@ After=network.target
 [Service]
 User=${USER}
 WorkingDirectory=${CURRENT_DIR}
-ExecStart=${CURRENT_DIR}/.venv/bin/python api.py
+ExecStart=${CURRENT_DIR}/.venv/bin/hypercorn --bind 0.0.0.0:8001 --workers 1 --worker-class uvloop api:app
 Restart=always
 RestartSec=10
 
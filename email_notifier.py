@@ -7,13 +7,100 @@
 """
 
 import os
+import time
+import atexit
 import logging
+import hashlib
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+from email.message import EmailMessage
 
 logger = logging.getLogger(__name__)
 
+SMTP_IDLE_TIMEOUT = 60  # 连接空闲超过该秒数后不再复用（多数服务器会主动断开空闲连接）
+
+class _SmtpPool:
+    """
+    进程内复用的SMTP连接
+    
+    第一次发送时建立连接（STARTTLS + 登录），之后同一服务器和账号的邮件复用该连接，
+    省去每封邮件的TLS握手和认证；发送前用NOOP检查连接，断开时自动重连一次。
+    RSS订阅、会议订阅和API的测试邮件都通过 send_email_message 共用这一个连接
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._server = None
+        self._key = None
+        self._last_used = 0.0
+    
+    def send(self, msg, smtp_server, smtp_port, username, password):
+        """通过复用的连接发送邮件"""
+        # 密码只以哈希形式保存在键中，修改密码后不会复用旧连接
+        key = (smtp_server, smtp_port, username, hashlib.sha256(password.encode('utf-8')).hexdigest())
+        with self._lock:
+            server = self._connection(key, password)
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # NOOP之后服务器仍可能断开，重连后再发一次
+                self._close()
+                server = self._connection(key, password)
+                server.send_message(msg)
+            self._last_used = time.monotonic()
+    
+    def close(self):
+        """关闭当前连接"""
+        with self._lock:
+            self._close()
+    
+    def _connection(self, key, password):
+        if self._server is not None:
+            if self._key == key and time.monotonic() - self._last_used < SMTP_IDLE_TIMEOUT:
+                try:
+                    if self._server.noop()[0] == 250:
+                        return self._server
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._close()
+        
+        smtp_server, smtp_port, username, _ = key
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        try:
+            # 使用TLS加密连接并登录
+            server.starttls()
+            server.login(username, password)
+        except Exception:
+            server.close()
+            raise
+        self._server, self._key = server, key
+        return server
+    
+    def _close(self):
+        server, self._server, self._key = self._server, None, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+_SMTP_POOL = _SmtpPool()
+atexit.register(_SMTP_POOL.close)
+
+def send_email_message(msg, smtp_server, smtp_port, username, password):
+    """
+    通过进程内复用的SMTP连接发送已构建好的邮件
+    
+    参数:
+        msg (EmailMessage): 邮件（From/To/Subject已设置）
+        smtp_server (str): SMTP服务器地址
+        smtp_port (int): SMTP端口
+        username (str): 登录用户名
+        password (str): 登录密码
+    """
+    _SMTP_POOL.send(msg, smtp_server, smtp_port, username, password)
+
 def send_notification(subject, message, to_email=None, config=None):
     """
     发送邮件通知
@@ -44,23 +131,15 @@ def send_notification(subject, message, to_email=None, config=None):
         return False
         
     try:
-        # 创建多部分消息
-        msg = MIMEMultipart()
+        # 只有一个纯文本正文，不需要多部分消息
+        msg = EmailMessage()
         msg['From'] = from_email
         msg['To'] = to_email
         msg['Subject'] = subject
+        msg.set_content(message)
         
-        # 添加正文
-        msg.attach(MIMEText(message, 'plain'))
-        
-        # 连接到SMTP服务器
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            # 使用TLS加密连接
-            server.starttls()
-            # 登录
-            server.login(smtp_username, smtp_password)
-            # 发送邮件
-            server.sendmail(from_email, to_email, msg.as_string())
+        # 通过复用的SMTP连接发送
+        send_email_message(msg, smtp_server, smtp_port, smtp_username, smtp_password)
             
         logger.info(f"成功发送邮件通知到 {to_email}")
         return True
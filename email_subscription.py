@@ -10,16 +10,28 @@ arXiv RSS 过滤机器人 - 邮件订阅模块
 
 import os
 import json
+import html
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from datetime import datetime, timezone
 import xml.etree.ElementTree as ET
 from config_loader import load_config
+from email_notifier import send_email_message
 import re
 from collections import defaultdict
 
+try:
+    import orjson  # C实现的JSON编解码，比标准库json快数倍
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    from lxml import etree as lxml_etree  # 可选：libxml2流式解析RSS
+except ImportError:  # lxml未安装时回退到标准库xml.etree
+    lxml_etree = None
+
 # 设置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -32,38 +44,144 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 HISTORY_DIR = os.path.join(SCRIPT_DIR, "history")
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
 SUBSCRIPTION_HISTORY_FILE = os.path.join(SCRIPT_DIR, "subscription_history.json")
+# 增量日志：每次发送只追加新的guid，快照只在日志过大时重写
+SUBSCRIPTION_LOG_FILE = os.path.join(SCRIPT_DIR, "subscription_history.log")
+HISTORY_LOG_COMPACT_BYTES = 1 << 20  # 日志超过1MB时合并进快照
+
+# 只允许http(s)链接写入href，避免javascript:等协议出现在邮件中
+_SAFE_LINK_RE = re.compile(r'^https?://', re.IGNORECASE)
+
+# 订阅邮件中不变的部分（样式表、页脚），只有摘要和论文列表需要每次生成
+_SUBSCRIPTION_EMAIL_HEAD = """<html>
+<head>
+  <style>
+    body { font-family: Arial, sans-serif; line-height: 1.6; }
+    .category { margin-bottom: 30px; }
+    .category-title { 
+      font-size: 20px; 
+      font-weight: bold; 
+      color: #2c3e50; 
+      margin-bottom: 15px;
+      padding-bottom: 5px;
+      border-bottom: 2px solid #3498db;
+    }
+    .paper { 
+      margin-bottom: 20px; 
+      padding: 15px; 
+      border: 1px solid #e0e0e0; 
+      border-radius: 8px;
+      background-color: #f9f9f9;
+    }
+    .title { font-size: 16px; font-weight: bold; color: #1a0dab; margin-bottom: 5px; }
+    .link { color: #1a0dab; text-decoration: none; }
+    .link:hover { text-decoration: underline; }
+    .pub-date { font-size: 12px; color: #666; margin-bottom: 8px; }
+    .description { font-size: 14px; color: #333; }
+    .category-summary { font-size: 14px; color: #7f8c8d; margin-bottom: 10px; }
+  </style>
+</head>
+<body>
+"""
+
+_SUBSCRIPTION_EMAIL_FOOTER = """
+  <hr style="margin-top: 40px; border: none; border-top: 1px solid #bdc3c7;">
+  <p style="text-align: center; color: #7f8c8d; font-size: 12px;">
+    由 arXiv RSS Filter Bot 自动生成 | 每日自动推送最新论文
+  </p>
+</body></html>"""
+
+def _json_dumps(obj):
+    """把对象序列化为紧凑的UTF-8 JSON bytes；有orjson时直接生成bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _replay_subscription_log(history):
+    """
+    把增量日志中的发送记录合并到快照中
+    
+    Args:
+        history (dict): 从快照加载的历史记录（原地更新）
+    """
+    if not os.path.exists(SUBSCRIPTION_LOG_FILE):
+        return history
+    
+    sent_papers = dict.fromkeys(history.get("sent_papers", []))  # 保持原有顺序并去重
+    last_sent = history.get("last_sent")
+    with open(SUBSCRIPTION_LOG_FILE, 'rb') as f:
+        for line in f:
+            try:
+                record = _json_loads(line)
+            except ValueError:
+                # 进程中断时最后一行可能不完整，跳过即可
+                continue
+            if record.get("id"):
+                sent_papers[record["id"]] = None
+            if record.get("t") and (last_sent is None or record["t"] > last_sent):
+                last_sent = record["t"]
+    
+    history["sent_papers"] = list(sent_papers)
+    history["last_sent"] = last_sent
+    return history
 
 def load_subscription_history():
     """
-    加载订阅历史记录，用于避免发送重复的论文
+    加载订阅历史记录（快照 + 增量日志），用于避免发送重复的论文
     
     Returns:
         dict: 包含已发送论文ID的字典
     """
-    if not os.path.exists(SUBSCRIPTION_HISTORY_FILE):
-        return {"sent_papers": [], "last_sent": None}
-    
+    history = {"sent_papers": [], "last_sent": None}
     try:
-        with open(SUBSCRIPTION_HISTORY_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if os.path.exists(SUBSCRIPTION_HISTORY_FILE):
+            with open(SUBSCRIPTION_HISTORY_FILE, 'rb') as f:
+                history = _json_loads(f.read())
+        return _replay_subscription_log(history)
     except Exception as e:
         logger.error(f"加载订阅历史记录失败: {str(e)}")
         return {"sent_papers": [], "last_sent": None}
 
 def save_subscription_history(history):
     """
-    保存订阅历史记录
+    保存订阅历史记录快照，并清空已合并进快照的增量日志
     
     Args:
         history (dict): 包含已发送论文ID的字典
     """
+    tmp_file = SUBSCRIPTION_HISTORY_FILE + ".tmp"
     try:
-        with open(SUBSCRIPTION_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2)
+        # 历史记录只由程序读取，不缩进，输出体积约减半
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(history))
+        os.replace(tmp_file, SUBSCRIPTION_HISTORY_FILE)
+        # 快照已包含日志中的全部记录，截断日志
+        if os.path.exists(SUBSCRIPTION_LOG_FILE):
+            open(SUBSCRIPTION_LOG_FILE, 'w').close()
         logger.info(f"订阅历史记录已保存到 {SUBSCRIPTION_HISTORY_FILE}")
     except Exception as e:
         logger.error(f"保存订阅历史记录失败: {str(e)}")
 
+def append_subscription_history(guids, sent_at):
+    """
+    把新发送的论文追加到增量日志，写入量只与新论文数量有关
+    
+    Args:
+        guids (iterable): 新发送论文的guid
+        sent_at (str): 发送时间（ISO格式）
+    """
+    try:
+        with open(SUBSCRIPTION_LOG_FILE, 'ab') as f:
+            f.writelines(_json_dumps({"id": guid, "t": sent_at}) + b"\n" for guid in guids)
+    except Exception as e:
+        logger.error(f"写入订阅历史日志失败: {str(e)}")
+
+def subscription_log_needs_compaction():
+    """增量日志超过阈值时需要重写快照"""
+    try:
+        return os.path.getsize(SUBSCRIPTION_LOG_FILE) > HISTORY_LOG_COMPACT_BYTES
+    except OSError:
+        return False
+
 def get_latest_rss_file():
     """
     获取最新的RSS文件
@@ -75,14 +193,28 @@ def get_latest_rss_file():
         logger.error(f"输出目录不存在: {OUTPUT_DIR}")
         return None
         
-    rss_files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.xml')]
-    if not rss_files:
+    # scandir的DirEntry缓存stat结果；只需要最新的一个文件，线性取最大值即可，不必排序
+    with os.scandir(OUTPUT_DIR) as it:
+        latest = max(
+            (e for e in it if e.name.endswith('.xml') and e.is_file()),
+            key=lambda e: e.stat().st_mtime_ns,
+            default=None
+        )
+    if latest is None:
         logger.info("没有找到RSS文件")
         return None
-        
-    # 按文件修改时间排序（最新在前）
-    rss_files.sort(key=lambda f: os.path.getmtime(os.path.join(OUTPUT_DIR, f)), reverse=True)
-    return os.path.join(OUTPUT_DIR, rss_files[0])
+    
+    return latest.path
+
+def _rss_item_to_paper(item):
+    """从<item>元素中提取论文信息"""
+    return {
+        'title': item.findtext('title') or 'No Title',
+        'link': item.findtext('link', ''),
+        'description': item.findtext('description', ''),
+        'guid': item.findtext('guid', ''),
+        'pubDate': item.findtext('pubDate', '')
+    }
 
 def parse_rss_file(rss_file):
     """
@@ -95,20 +227,28 @@ def parse_rss_file(rss_file):
         list: 论文信息列表
     """
     try:
-        tree = ET.parse(rss_file)
-        root = tree.getroot()
-        
+        # 逐个<item>流式解析，处理完的元素立即从父节点删除，不在内存中构建整棵树
         papers = []
-        for item in root.findall('./channel/item'):
-            paper = {
-                'title': item.find('title').text if item.find('title') is not None else 'No Title',
-                'link': item.find('link').text if item.find('link') is not None else '',
-                'description': item.find('description').text if item.find('description') is not None else '',
-                'guid': item.find('guid').text if item.find('guid') is not None else '',
-                'pubDate': item.find('pubDate').text if item.find('pubDate') is not None else ''
-            }
-            papers.append(paper)
-            
+        if lxml_etree is not None:
+            for _, item in lxml_etree.iterparse(rss_file, tag='item'):
+                papers.append(_rss_item_to_paper(item))
+                item.clear()
+                # 删除已处理的兄弟节点，保持内存占用恒定
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+        else:
+            # 标准库元素没有getparent()，用start事件记录当前路径上的元素来找到父节点
+            path = []
+            for event, elem in ET.iterparse(rss_file, events=('start', 'end')):
+                if event == 'start':
+                    path.append(elem)
+                    continue
+                path.pop()
+                if elem.tag == 'item':
+                    papers.append(_rss_item_to_paper(elem))
+                    if path:
+                        path[-1].remove(elem)
+        
         return papers
     except Exception as e:
         logger.error(f"解析RSS文件失败: {str(e)}")
@@ -228,55 +368,27 @@ def send_subscription_email(papers, config):
         total_papers = sum(len(papers_in_cat) for papers_in_cat in categorized_papers.values())
         
         # 创建邮件
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = username
         msg['To'] = recipient
         msg['Subject'] = f"arXiv RSS Filter Bot - 最新论文更新 ({datetime.now().strftime('%Y-%m-%d')})"
         
-        # 构建邮件正文
-        body = f"""<html>
-<head>
-  <style>
-    body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-    .category {{ margin-bottom: 30px; }}
-    .category-title {{ 
-      font-size: 20px; 
-      font-weight: bold; 
-      color: #2c3e50; 
-      margin-bottom: 15px;
-      padding-bottom: 5px;
-      border-bottom: 2px solid #3498db;
-    }}
-    .paper {{ 
-      margin-bottom: 20px; 
-      padding: 15px; 
-      border: 1px solid #e0e0e0; 
-      border-radius: 8px;
-      background-color: #f9f9f9;
-    }}
-    .title {{ font-size: 16px; font-weight: bold; color: #1a0dab; margin-bottom: 5px; }}
-    .link {{ color: #1a0dab; text-decoration: none; }}
-    .link:hover {{ text-decoration: underline; }}
-    .pub-date {{ font-size: 12px; color: #666; margin-bottom: 8px; }}
-    .description {{ font-size: 14px; color: #333; }}
-    .category-summary {{ font-size: 14px; color: #7f8c8d; margin-bottom: 10px; }}
-  </style>
-</head>
-<body>
-  <h2>🎯 arXiv RSS Filter Bot - 最新论文更新</h2>
+        # 构建邮件正文：各片段追加到列表，最后一次性拼接（避免重复 += 拷贝整个字符串）
+        parts = [_SUBSCRIPTION_EMAIL_HEAD, f"""  <h2>🎯 arXiv RSS Filter Bot - 最新论文更新</h2>
   <p>共找到 <strong>{total_papers}</strong> 篇符合您兴趣的最新论文，按类别整理如下：</p>
-"""
+"""]
+        append = parts.append
         
         # 按分类添加论文
         for category_name, papers_in_category in categorized_papers.items():
             if not papers_in_category:
                 continue
                 
-            body += f"""
+            append(f"""
   <div class="category">
-    <div class="category-title">{category_name}</div>
+    <div class="category-title">{html.escape(category_name)}</div>
     <div class="category-summary">本类别共 {len(papers_in_category)} 篇论文，按发表时间排序：</div>
-"""
+""")
             
             for paper in papers_in_category:
                 title = paper['title']
@@ -308,32 +420,29 @@ def send_subscription_email(papers, config):
                         # 如果没找到Authors:行，使用原始描述但去除多余换行
                         description = ' '.join(line.strip() for line in lines if line.strip())
                 
-                body += f"""
+                if not _SAFE_LINK_RE.match(link or ''):
+                    link = ''
+                
+                # 标题、摘要等来自外部数据，转义后再写入HTML
+                append(f"""
     <div class="paper">
-      <div class="title"><a href="{link}" class="link">{title}</a></div>
-      <div class="pub-date">📅 发表日期: {pub_date}</div>
-      <div class="pub-date">👥 作者: {authors}</div>
-      <div class="description">{description}</div>
+      <div class="title"><a href="{html.escape(link)}" class="link">{html.escape(title or '')}</a></div>
+      <div class="pub-date">📅 发表日期: {html.escape(pub_date or '')}</div>
+      <div class="pub-date">👥 作者: {html.escape(authors)}</div>
+      <div class="description">{html.escape(description)}</div>
     </div>
-"""
+""")
             
-            body += "  </div>"  # 关闭category div
+            append("  </div>")  # 关闭category div
         
-        body += """
-  <hr style="margin-top: 40px; border: none; border-top: 1px solid #bdc3c7;">
-  <p style="text-align: center; color: #7f8c8d; font-size: 12px;">
-    由 arXiv RSS Filter Bot 自动生成 | 每日自动推送最新论文
-  </p>
-</body></html>"""
+        append(_SUBSCRIPTION_EMAIL_FOOTER)
+        body = "".join(parts)
         
         # 添加HTML正文
-        msg.attach(MIMEText(body, 'html'))
+        msg.set_content(body, subtype='html')
         
-        # 发送邮件
-        with smtplib.SMTP(smtp_server, port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
+        # 发送邮件（复用进程内的SMTP连接）
+        send_email_message(msg, smtp_server, port, username, password)
             
         logger.info(f"成功发送订阅邮件到 {recipient}")
         return True
@@ -367,7 +476,8 @@ def run_subscription():
     
     # 加载订阅历史记录
     subscription_history = load_subscription_history()
-    sent_papers = set(subscription_history.get("sent_papers", []))
+    # 用dict作有序集合：成员检查同样是O(1)，合并快照时保持发送顺序
+    sent_papers = dict.fromkeys(subscription_history.get("sent_papers", []))
     logger.info(f"已加载订阅历史记录，共有 {len(sent_papers)} 篇已发送论文")
     
     # 获取最新的RSS文件
@@ -389,13 +499,16 @@ def run_subscription():
         success = send_subscription_email(new_papers, config)
         
         if success:
-            # 更新订阅历史记录
-            for paper in new_papers:
-                sent_papers.add(paper['guid'])
+            # 更新订阅历史记录：新guid追加到增量日志，日志过大时才重写完整快照
+            sent_at = datetime.now().isoformat()
+            new_guids = [paper['guid'] for paper in new_papers]
+            sent_papers.update(dict.fromkeys(new_guids))
+            append_subscription_history(new_guids, sent_at)
             
-            subscription_history["sent_papers"] = list(sent_papers)
-            subscription_history["last_sent"] = datetime.now().isoformat()
-            save_subscription_history(subscription_history)
+            if subscription_log_needs_compaction():
+                subscription_history["sent_papers"] = list(sent_papers)
+                subscription_history["last_sent"] = sent_at
+                save_subscription_history(subscription_history)
             
             logger.info(f"成功发送 {len(new_papers)} 篇新论文，并更新了订阅历史记录")
             return True
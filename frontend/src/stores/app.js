@@ -8,6 +8,7 @@ export const useAppStore = defineStore('app', () => {
   const theme = ref(localStorage.getItem('theme') || 'light')
   const drawer = ref(true)
   const isRunning = ref(false)
+  const runProgress = ref(0)
   const status = ref({
     lastRun: null,
     lastFeed: null,
@@ -25,10 +26,40 @@ export const useAppStore = defineStore('app', () => {
     drawer.value = !drawer.value
   }
 
+  // 订阅后台任务的SSE进度流，直到收到 done/error 消息
+  function waitForJob(jobId, onProgress) {
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`/api/progress/${jobId}`)
+      source.onmessage = (event) => {
+        const msg = JSON.parse(event.data)
+        if (onProgress) onProgress(msg)
+        if (msg.status === 'done' || msg.status === 'error') {
+          source.close()
+          resolve(msg)
+        }
+      }
+      source.onerror = () => {
+        // 服务端在超时后关闭连接时浏览器会自动重连；任务已不存在时才放弃
+        if (source.readyState === EventSource.CLOSED) {
+          reject(new Error('Lost connection to job progress stream'))
+        }
+      }
+    })
+  }
+
   async function runBot() {
     try {
       isRunning.value = true
-      const response = await axios.post('/api/run')
+      runProgress.value = 0
+      const startResponse = await axios.post('/api/run')
+      if (!startResponse.data.success) {
+        return { success: false, error: startResponse.data.error }
+      }
+      const response = {
+        data: await waitForJob(startResponse.data.job_id, (msg) => {
+          runProgress.value = msg.percent
+        })
+      }
       
       if (response.data.success) {
         await fetchStatus()
@@ -69,10 +100,12 @@ export const useAppStore = defineStore('app', () => {
     theme,
     drawer,
     isRunning,
+    runProgress,
     status,
     toggleTheme,
     toggleDrawer,
     runBot,
+    waitForJob,
     fetchStatus
   }
 })
\ No newline at end of file
@@ -20,6 +20,7 @@ from datetime import datetime, timedelta  # 导入日期时间模块
 import uuid  # 导入UUID模块，用于生成唯一标识符
 import json  # 导入JSON模块，用于处理JSON数据
 import time  # 导入时间模块
+import threading  # 导入线程模块，用于保护历史记录索引
 
 # 导入定时任务相关模块
 from apscheduler.schedulers.blocking import BlockingScheduler  # 阻塞式调度器
@@ -51,6 +52,8 @@ logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")  # 设置输出目录为当前文件同级的output目录
 LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")  # 设置日志目录为当前文件同级的logs目录
 HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")  # 设置历史记录目录
+HISTORY_INDEX_FILE = os.path.join(HISTORY_DIR, "index.jsonl")  # 历史记录摘要索引（每行一条JSON）
+HISTORY_INDEX_LOCK = threading.Lock()  # 索引追加与API重建索引互斥，避免重建替换文件时丢失新追加的行
 
 # 确保必要的目录存在
 os.makedirs(OUTPUT_DIR, exist_ok=True)  # 创建输出目录（如果不存在）
@@ -125,23 +128,48 @@ def save_history_record(config, processed_papers, output_file):
         with open(history_file, 'w', encoding='utf-8') as f:
             json.dump(history_record, f, indent=2)
         
+        # 追加到历史记录索引，API列出历史时只需读取索引而不必逐个打开记录文件
+        # 索引不存在时不创建，由API在首次读取时遍历目录完整重建
+        summary = {
+            'id': history_id,
+            'timestamp': timestamp,
+            'papers_count': history_record['papers_count'],
+            'keywords': history_record['config']['keywords'],
+            'categories': history_record['config']['categories'],
+            'output_file': history_record['output_file']
+        }
+        with HISTORY_INDEX_LOCK:
+            if os.path.exists(HISTORY_INDEX_FILE):
+                with open(HISTORY_INDEX_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        
         logger.info(f"历史记录已保存: {history_file}")
         return history_id
     except Exception as e:
         logger.error(f"保存历史记录失败: {str(e)}")
         return None
 
-def run_pipeline_with_subscription():
-    """运行包含邮件订阅的完整流水线"""
+def _report_progress(progress, stage, percent):
+    """调用进度回调（未提供回调时忽略）"""
+    if progress is not None:
+        progress(stage, percent)
+
+def run_pipeline_with_subscription(progress=None):
+    """运行包含邮件订阅的完整流水线
+    
+    Args:
+        progress (callable, optional): 进度回调 progress(阶段名, 百分比)，传给 run_pipeline
+    """
     try:
         # 首先运行基本流程
-        result = run_pipeline()
+        result = run_pipeline(progress=progress)
         
         if result.get('success') and result.get('papers_count', 0) > 0:
             # 只有在成功生成论文时才运行邮件订阅
             config = load_config()
             if config.get('email_subscription', False):
                 logger.info("Running email subscription after RSS generation...")
+                _report_progress(progress, 'subscription', 90)
                 subscription_result = run_subscription()
                 if subscription_result:
                     logger.info("Email subscription completed successfully")
@@ -163,7 +191,7 @@ def run_pipeline_with_subscription():
             "message": "Pipeline with subscription failed"
         }
 
-def run_pipeline():
+def run_pipeline(progress=None):
     """运行完整的处理流水线
     
     这是主要的工作流程函数，包括：
@@ -174,6 +202,9 @@ def run_pipeline():
     5. 生成RSS订阅源
     6. 处理可能出现的错误
     
+    Args:
+        progress (callable, optional): 进度回调 progress(阶段名, 百分比)，在各阶段开始时调用
+    
     Returns:
         dict: 包含处理结果的字典，包括生成的RSS文件路径、处理的论文数量等
     """
@@ -200,6 +231,7 @@ def run_pipeline():
         fetch_start_time = datetime.now()
         
         # 尝试获取论文，加入重试逻辑
+        _report_progress(progress, 'fetch', 10)
         max_retries = 3
         retry_count = 0
         papers = []
@@ -219,6 +251,7 @@ def run_pipeline():
         logger.info(f"Fetched {len(papers)} papers from arXiv")  # 记录获取的论文数量
         
         # 处理论文（过滤、提取信息）
+        _report_progress(progress, 'filter', 50)
         processed_papers = process_papers(papers, config)  # 处理论文
         logger.info(f"Processed down to {len(processed_papers)} papers after filtering")  # 记录过滤后的论文数量
         
@@ -238,6 +271,7 @@ def run_pipeline():
             # 确保输出目录存在
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             # 生成RSS文件
+            _report_progress(progress, 'rss', 75)
             rss_file = generate_rss(
                 processed_papers, 
                 output_file,
@@ -246,6 +280,7 @@ def run_pipeline():
             )
             logger.info(f"Generated RSS feed at {rss_file}")
             # 保存历史记录
+            _report_progress(progress, 'history', 85)
             history_id = save_history_record(config, processed_papers, output_file)
             logger.info(f"Saved history record with ID: {history_id}")
             
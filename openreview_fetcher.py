@@ -12,10 +12,19 @@ import os
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from typing import Dict, List
 from config_loader import load_config
 
+try:
+    import orjson  # C实现的JSON编解码，比标准库json快数倍
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 # 设置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +41,12 @@ CONFERENCE_HISTORY_DIR = os.path.join(SCRIPT_DIR, "conference_history")
 os.makedirs(CONFERENCE_OUTPUT_DIR, exist_ok=True)
 os.makedirs(CONFERENCE_HISTORY_DIR, exist_ok=True)
 
+def _json_dumps(obj, indent=False):
+    """把对象序列化为UTF-8 JSON bytes；有orjson时直接生成bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
 class OpenReviewClient:
     """OpenReview API 客户端"""
     
@@ -44,10 +59,28 @@ class OpenReviewClient:
             'User-Agent': 'arXiv-RSS-Bot-Conference-Fetcher/1.0',
             'Content-Type': 'application/json'
         }
+        # 登录和后续查询共用一个会话，复用TCP/TLS连接；429和5xx由urllib3退避重试
+        self.session = self._create_session()
         
         if username and password:
             self._authenticate()
     
+    @staticmethod
+    def _create_session():
+        """创建带连接池和重试的会话"""
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            raise_on_status=False  # 重试耗尽后返回最后的响应，由调用方检查状态码
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
     def _authenticate(self):
         """认证获取token"""
         try:
@@ -56,7 +89,7 @@ class OpenReviewClient:
                 'password': self.password
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.baseurl}/login",
                 json=auth_data,
                 headers=self.headers,
@@ -91,7 +124,7 @@ class OpenReviewClient:
                 # 默认查询被接收的论文
                 params['content.venueid'] = venue_id
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.baseurl}/notes",
                 params=params,
                 headers=self.headers,
@@ -114,7 +147,7 @@ class OpenReviewClient:
     def get_venue_info(self, venue_id: str) -> Dict:
         """获取会议信息"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.baseurl}/groups",
                 params={'id': venue_id},
                 headers=self.headers,
@@ -222,8 +255,9 @@ class ConferencePaperProcessor:
         }
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            # 会议论文文件保留缩进，方便人工查看
+            with open(filepath, 'wb') as f:
+                f.write(_json_dumps(output_data, indent=True))
             
             logger.info(f"成功保存{len(papers)}篇论文到{filepath}")
             return filepath
@@ -271,8 +305,8 @@ def load_conference_history(conference_name: str) -> Dict:
         return {"fetched_papers": [], "last_fetch": None}
     
     try:
-        with open(history_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(history_file, 'rb') as f:
+            return _json_loads(f.read())
     except Exception as e:
         logger.error(f"加载会议历史记录失败: {str(e)}")
         return {"fetched_papers": [], "last_fetch": None}
@@ -282,14 +316,14 @@ def save_conference_history(conference_name: str, history: Dict):
     history_file = os.path.join(CONFERENCE_HISTORY_DIR, f"{conference_name.lower().replace(' ', '_')}_history.json")
     
     try:
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        with open(history_file, 'wb') as f:
+            f.write(_json_dumps(history, indent=True))
         logger.info(f"{conference_name}历史记录已保存")
     except Exception as e:
         logger.error(f"保存会议历史记录失败: {str(e)}")
 
-def run_conference_fetch():
-    """运行会议论文获取"""
+def run_conference_fetch(conference_names=None):
+    """运行会议论文获取；conference_names不为None时只获取其中列出的会议"""
     logger.info("开始运行会议论文获取")
     
     # 加载配置
@@ -305,6 +339,9 @@ def run_conference_fetch():
     
     # 获取会议列表
     conference_list = conferences_config.get('conference_list', [])
+    if conference_names is not None:
+        name_set = frozenset(conference_names)
+        conference_list = [conf for conf in conference_list if conf.get('name') in name_set]
     if not conference_list:
         logger.info("没有配置会议列表")
         return False
@@ -125,6 +125,38 @@ def test_nonexistent_file():
         logger.error(f"测试失败：抛出了意外的异常类型: {type(e).__name__}")
         return False
 
+def test_config_cache():
+    """测试配置缓存：返回副本，文件修改后重新加载"""
+    logger.info("测试配置缓存")
+    
+    test_config = {
+        'keywords': ['test'],
+        'max_results': 50
+    }
+    
+    test_file = 'test_cache_config.yaml'
+    
+    assert create_test_config(test_file, test_config), "创建测试配置文件失败"
+    try:
+        # 修改返回的配置不应影响缓存
+        config = load_config(test_file)
+        config['keywords'].append('mutated')
+        assert load_config(test_file)['keywords'] == ['test'], "缓存的配置被调用者修改"
+        
+        # 修改文件后应重新解析
+        test_config['max_results'] = 100
+        create_test_config(test_file, test_config)
+        st = os.stat(test_file)
+        os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_config(test_file)['max_results'] == 100, "文件修改后未重新加载配置"
+        
+        logger.info("配置缓存测试通过")
+        return True
+    finally:
+        # 清理测试文件
+        if os.path.exists(test_file):
+            os.remove(test_file)
+
 def test_actual_config():
     """测试实际的配置文件"""
     logger.info("测试实际的配置文件 (config.yaml)")
@@ -154,6 +186,7 @@ def run_tests():
         ("有效配置测试", test_valid_config),
         ("缺少必要参数测试", test_missing_required),
         ("不存在的文件测试", test_nonexistent_file),
+        ("配置缓存测试", test_config_cache),
         ("实际配置测试", test_actual_config)
     ]
     
@@ -162,7 +195,13 @@ def run_tests():
     
     for name, test_func in tests:
         logger.info(f"执行测试: {name}")
-        if test_func():
+        # 断言失败的测试也计为失败
+        try:
+            result = test_func()
+        except AssertionError as e:
+            logger.error(f"断言失败: {str(e)}")
+            result = False
+        if result:
             logger.info(f"测试通过: {name}")
             passed += 1
         else:
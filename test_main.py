@@ -10,6 +10,9 @@ import sys
 import time
 import argparse
 import subprocess
+import tempfile
+import threading
+from unittest import mock
 from datetime import datetime
 
 # 设置日志
@@ -123,6 +126,44 @@ def test_main():
         logger.error("主程序运行失败")
         return False
 
+def test_history_index_append_during_rebuild():
+    """重建历史记录索引期间保存的记录不应丢失"""
+    logger.info("测试重建索引期间追加历史记录")
+    
+    import api
+    import main
+    
+    with tempfile.TemporaryDirectory() as history_dir:
+        index_file = os.path.join(history_dir, "index.jsonl")
+        config = {'keywords': ['test'], 'categories': ['cs.AI']}
+        with mock.patch.object(main, 'HISTORY_DIR', history_dir), \
+                mock.patch.object(main, 'HISTORY_INDEX_FILE', index_file), \
+                mock.patch.object(api, 'HISTORY_DIR', history_dir), \
+                mock.patch.object(api, 'HISTORY_INDEX_FILE', index_file):
+            first_id = main.save_history_record(config, [], 'first.xml')
+            api._rebuild_history_index()
+            
+            # 重建读取记录文件时，另一个线程保存新记录并追加到索引
+            saved = {}
+            saver = threading.Thread(target=lambda: saved.update(id=main.save_history_record(config, [], 'second.xml')))
+            read_summary = api._read_history_summary
+            
+            def slow_read_summary(file):
+                if not saver.is_alive() and 'id' not in saved:
+                    saver.start()
+                    time.sleep(0.2)  # 让保存线程在索引替换之前完成记录文件写入并尝试追加
+                return read_summary(file)
+            
+            with mock.patch.object(api, '_read_history_summary', slow_read_summary):
+                api._rebuild_history_index()
+            saver.join()
+            
+            ids = {record['id'] for record in api._load_history_index()}
+            assert ids == {first_id, saved['id']}, f"索引缺少记录: {ids}"
+    
+    logger.info("重建索引期间追加历史记录测试通过")
+    return True
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='测试arXiv RSS Filter Bot主程序')
     parser.add_argument('--check-only', action='store_true', 